@@ -0,0 +1,39 @@
+from flask import Flask
+import config
+from utility import admission, compression, metrics, profiling
+from utility.jsoncodec import JSONProvider
+
+
+def create_app(*blueprints):
+    """Build a Flask app serving the given API blueprints, with Swagger unless SWAGGER=0
+
+    With no arguments both the user and the destination APIs are mounted in
+    one app, so they share a process and its caches. Both define `GET /`;
+    the user API's welcome page answers it.
+    """
+    if not blueprints:
+        from controller.destination_routes import destination_api
+        from controller.user_routes import user_api
+        blueprints = (user_api, destination_api)
+
+    app = Flask(__name__)
+    app.json = JSONProvider(app)
+    for blueprint in blueprints:
+        app.register_blueprint(blueprint)
+    if config.METRICS_ENABLED:
+        metrics.init_app(app)
+    if config.ADMISSION_ENABLED:
+        admission.init_app(app)
+    if config.PROFILE_ENABLED:
+        profiling.init_app(app)
+    if config.COMPRESSION_ENABLED:
+        compression.init_app(app)
+    if config.SWAGGER_ENABLED:
+        # Imported here so production processes with Swagger off never load flasgger
+        from utility.apispec import CachedSwagger
+        app.extensions["swagger"] = CachedSwagger(app)
+    return app
+
+
+if __name__ == "__main__":
+    create_app().run(debug=True, port=5000)
@@ -0,0 +1,129 @@
+import asyncio
+import contextvars
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+import config
+from application import create_app
+
+# Request bodies larger than this are spooled to a temporary file
+BODY_SPOOL_BYTES = 64 * 1024
+
+
+def _environ(scope, body):
+    """Translate an ASGI HTTP scope into a WSGI environ"""
+    script_name = scope.get("root_path", "").encode("utf8").decode("latin1")
+    path_info = scope["path"].encode("utf8").decode("latin1")
+    if script_name and path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": script_name,
+        "PATH_INFO": path_info,
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        # The whole body is buffered, so it can be read to the end without a Content-Length
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1").upper().replace("-", "_")
+        if name not in ("CONTENT_LENGTH", "CONTENT_TYPE"):
+            name = "HTTP_" + name
+        value = value.decode("latin1")
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+class AsgiAdapter:
+    """Serve a WSGI app over ASGI without tying a thread to each slow client
+
+    Request bodies are read and responses written on the event loop. Only the
+    Flask view itself (storage, JWT checks, waiting on the password hashing
+    pool) and each chunk of a streamed response run on a bounded thread pool.
+    """
+
+    def __init__(self, wsgi_app, workers=None):
+        self.wsgi_app = wsgi_app
+        self.workers = workers or config.ASGI_WORKERS
+        self._executor = None
+
+    @property
+    def executor(self):
+        # Created on first use so the pool belongs to the serving process, not a pre-fork parent
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asgi")
+        return self._executor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']!r}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        with SpooledTemporaryFile(max_size=BODY_SPOOL_BYTES) as body:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                body.write(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+            body.seek(0)
+
+            response = {}
+
+            def start_response(status, headers, exc_info=None):
+                response["status"] = int(status.split(" ", 1)[0])
+                response["headers"] = [(name.lower().encode("latin1"), value.encode("latin1")) for name, value in headers]
+
+            def begin():
+                iterable = self.wsgi_app(_environ(scope, body), start_response)
+                iterator = iter(iterable)
+                # Generators only call start_response once they are first advanced
+                return iterable, iterator, next(iterator, None)
+
+            # Streamed bodies resume in whichever worker is free; one context keeps Flask's request context with them
+            context = contextvars.copy_context()
+            loop = asyncio.get_running_loop()
+            iterable, iterator, chunk = await loop.run_in_executor(self.executor, context.run, begin)
+            try:
+                await send({"type": "http.response.start", "status": response["status"], "headers": response["headers"]})
+                while chunk is not None:
+                    if chunk:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                    chunk = await loop.run_in_executor(self.executor, context.run, next, iterator, None)
+                await send({"type": "http.response.body"})
+            finally:
+                close = getattr(iterable, "close", None)
+                if close:
+                    await loop.run_in_executor(self.executor, context.run, close)
+
+
+# Both APIs in one process; serve with an ASGI server, e.g. `uvicorn asgi:app`
+app = AsgiAdapter(create_app())
@@ -0,0 +1,51 @@
+import json
+import os
+import random
+from utility.password import hash_password
+
+# Every generated account shares this password; the benchmark logs in with it
+PASSWORD = "benchpass"
+ADMIN_EMAIL = "admin@example.com"
+USER_EMAIL = "user1@example.com"
+
+WORDS = (
+    "ancient beach canyon castle city coast desert forest garden harbor island lake market "
+    "mountain museum palace park river ruins temple tower valley village volcano waterfall"
+).split()
+LOCATIONS = ("USA", "Japan", "France", "Italy", "Peru", "Kenya", "India", "Norway", "Brazil", "Egypt")
+
+
+def generate_users(size):
+    """Return `size` users: one admin, the rest regular users, all with PASSWORD"""
+    # One hash for every row: hashing a million passwords would dominate generation time
+    password = hash_password(PASSWORD)
+    users = [{"username": "admin", "email": ADMIN_EMAIL, "password": password, "role": "admin"}]
+    users.extend(
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password": password, "role": "user"}
+        for i in range(1, size)
+    )
+    return users
+
+
+def generate_destinations(size, seed=0):
+    """Return `size` destinations with Ids 1..size and random names and descriptions"""
+    rng = random.Random(seed)
+    return [
+        {
+            "Id": i,
+            "Name": " ".join(rng.choice(WORDS) for _ in range(2)).title(),
+            "Description": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "Location": rng.choice(LOCATIONS),
+        }
+        for i in range(1, size + 1)
+    ]
+
+
+def write_dataset(directory, size):
+    """Write db/users.py and db/destinations.py with `size` rows each under directory"""
+    db = os.path.join(directory, "db")
+    os.makedirs(db, exist_ok=True)
+    for name, rows in (("users.py", generate_users(size)), ("destinations.py", generate_destinations(size))):
+        with open(os.path.join(db, name), "w") as file:
+            json.dump(rows, file, indent=4)
+    return db
@@ -0,0 +1,249 @@
+"""Benchmark every route against synthetic datasets
+
+    python -m benchmarks.run --sizes 1000,100000 --mode both --output bench.json
+    python -m benchmarks.run --sizes 1000 --compare bench.json
+
+Each dataset size gets a fresh temporary db/ directory. In "client" mode
+the routes are driven through the Flask test client in this process; in
+"server" mode a real threaded server is started on a local port and hit
+over HTTP by --concurrency client threads. Results (throughput and
+p50/p95/p99 latency per mode, size and route) are written as JSON.
+"""
+import argparse
+import datetime
+import http.client
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+from benchmarks.datasets import ADMIN_EMAIL, PASSWORD, USER_EMAIL, write_dataset
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _routes(size):
+    """(route name, builder) pairs; a builder turns the request number into (method, path, body, token name)"""
+    return [
+        ("GET /", lambda i: ("GET", "/", None, None)),
+        ("POST /register", lambda i: ("POST", "/register", {
+            "username": f"bench{i}", "email": f"bench{i}@example.com", "password": PASSWORD,
+        }, None)),
+        ("POST /login", lambda i: ("POST", "/login", {"email": USER_EMAIL, "password": PASSWORD}, None)),
+        ("GET /profile", lambda i: ("GET", "/profile", None, "user")),
+        ("PATCH /profile", lambda i: ("PATCH", "/profile", {"email": USER_EMAIL}, "user")),
+        ("GET /destination", lambda i: ("GET", "/destination", None, None)),
+        ("GET /destination?limit=20", lambda i: ("GET", f"/destination?limit=20&cursor={(i * 7919) % size}", None, None)),
+        ("GET /destination/search", lambda i: ("GET", "/destination/search?q=temple%20riv", None, None)),
+        ("POST /destination", lambda i: ("POST", "/destination", {
+            "Id": size + i + 1, "Name": "Bench", "Description": "Added by the benchmark", "Location": "USA",
+        }, "admin")),
+        ("POST /destination/bulk", lambda i: ("POST", "/destination/bulk", [
+            {"Id": size + 500_000 + i * 100 + j, "Name": "Bulk", "Description": "Bulk row", "Location": "USA"}
+            for j in range(100)
+        ], "admin")),
+        ("DELETE /destination/<id>", lambda i: ("DELETE", f"/destination/{size + i + 1}", None, "admin")),
+    ]
+
+
+class TestClientTarget:
+    """Send requests through the Flask test client, against the dataset in directory"""
+
+    def __init__(self, directory):
+        import model.destination as destination_model
+        import model.user as user_model
+        from application import create_app
+
+        user_model.user_file_path = os.path.join(directory, "db", "users.py")
+        user_model._store = None
+        destination_model.destination_file_path = os.path.join(directory, "db", "destinations.py")
+        destination_model._catalog = None
+        destination_model._search = {"version": None, "index": None, "builder": None}
+        self.client = create_app().test_client()
+
+    def request(self, method, path, body, headers):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        response.close()
+        return response.status_code, response.get_data()
+
+    def close(self):
+        pass
+
+
+class ServerTarget:
+    """Start a threaded server on a free local port, serving the dataset in directory"""
+
+    def __init__(self, directory):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        env = dict(os.environ, PYTHONPATH=REPO, PASSWORD_HASH_ITERATIONS=str(config.PASSWORD_HASH_ITERATIONS),
+                   ADMISSION="1" if config.ADMISSION_ENABLED else "0")
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", "from application import create_app; "
+             f"create_app().run(port={self.port}, threaded=True)"],
+            cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+                break
+            except OSError:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Benchmark server did not start")
+                time.sleep(0.1)
+        self._connections = {}
+
+    def request(self, method, path, body, headers):
+        # One keep-alive connection per client thread
+        key = threading.get_ident()
+        connection = self._connections.get(key)
+        if connection is None:
+            connection = self._connections[key] = http.client.HTTPConnection("127.0.0.1", self.port, timeout=300)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = dict(headers, **({"Content-Type": "application/json"} if payload is not None else {}))
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+
+    def close(self):
+        for connection in self._connections.values():
+            connection.close()
+        self.process.terminate()
+        self.process.wait()
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def _login(target, email):
+    status, body = target.request("POST", "/login", {"email": email, "password": PASSWORD}, {})
+    if status != 201:
+        raise RuntimeError(f"Benchmark login for {email} failed with {status}")
+    return json.loads(body)["token"]
+
+
+def bench_route(target, build, requests, concurrency, tokens):
+    """Time `requests` calls of one route and summarize them"""
+    def call(i):
+        method, path, body, token = build(i)
+        headers = {"Authorization": f"Bearer {tokens[token]}"} if token else {}
+        start = time.perf_counter()
+        status, _ = target.request(method, path, body, headers)
+        return time.perf_counter() - start, status
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(call, range(requests)))
+    else:
+        samples = [call(i) for i in range(requests)]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in samples)
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, status in samples if status >= 400),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run(sizes, modes, requests, concurrency, route_filter=None):
+    results = []
+    for size in sizes:
+        for mode in modes:
+            with tempfile.TemporaryDirectory(prefix=f"bench-{size}-") as directory:
+                write_dataset(directory, size)
+                target = TestClientTarget(directory) if mode == "client" else ServerTarget(directory)
+                try:
+                    tokens = {"admin": _login(target, ADMIN_EMAIL), "user": _login(target, USER_EMAIL)}
+                    for name, build in _routes(size):
+                        if route_filter and not any(part in name for part in route_filter):
+                            continue
+                        summary = bench_route(target, build, requests, concurrency if mode == "server" else 1, tokens)
+                        results.append({"mode": mode, "size": size, "route": name, **summary})
+                        print(f"{mode:6} {size:>8} {name:28} {summary['throughput_rps']:>9} req/s  "
+                              f"p50 {summary['p50_ms']:>9} ms  p95 {summary['p95_ms']:>9} ms  "
+                              f"p99 {summary['p99_ms']:>9} ms  errors {summary['errors']}", flush=True)
+                finally:
+                    target.close()
+    return results
+
+
+def compare(baseline, results):
+    """Print the p95 and throughput change of each result against a previous run"""
+    previous = {(entry["mode"], entry["size"], entry["route"]): entry for entry in baseline["results"]}
+    for entry in results:
+        before = previous.get((entry["mode"], entry["size"], entry["route"]))
+        if not before:
+            continue
+        p95 = (entry["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        rps = ((entry["throughput_rps"] or 0) - (before["throughput_rps"] or 0)) / before["throughput_rps"] * 100 \
+            if before["throughput_rps"] else 0.0
+        print(f"{entry['mode']:6} {entry['size']:>8} {entry['route']:28} p95 {p95:+7.1f}%  throughput {rps:+7.1f}%")
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated row counts, e.g. 1000,100000,1000000")
+    parser.add_argument("--mode", choices=("client", "server", "both"), default="both")
+    parser.add_argument("--requests", type=int, default=100, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads in server mode")
+    parser.add_argument("--routes", help="comma-separated substrings; only matching routes run")
+    parser.add_argument("--hash-iterations", type=int, default=config.PASSWORD_HASH_ITERATIONS,
+                        help="PBKDF2 iterations for generated and new passwords")
+    parser.add_argument("--admission", action="store_true",
+                        help="keep the admission limits on (by default they are off, to measure the routes themselves)")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--compare", help="previous JSON output to diff against")
+    args = parser.parse_args(argv)
+
+    config.PASSWORD_HASH_ITERATIONS = args.hash_iterations
+    config.ADMISSION_ENABLED = args.admission
+    sizes = [int(size) for size in args.sizes.split(",")]
+    modes = ("client", "server") if args.mode == "both" else (args.mode,)
+    route_filter = args.routes.split(",") if args.routes else None
+    results = run(sizes, modes, args.requests, args.concurrency, route_filter)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), results)
+    return report
+
+
+if __name__ == "__main__":
+    main()
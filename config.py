@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+
+# Storage backend for users and destinations: "json" (db/*.py files) or "sqlite"
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json")
+
+# SQLite database file, used when STORAGE_BACKEND is "sqlite"
+SQLITE_PATH = os.environ.get("SQLITE_PATH", os.path.join("db", "app.sqlite3"))
+
+# Append destination adds/deletes to db/destinations.journal instead of rewriting
+# db/destinations.py; the journal is folded back into the snapshot once it holds
+# JOURNAL_COMPACT_THRESHOLD records. Only applies to the "json" backend.
+DESTINATION_JOURNAL = os.environ.get("DESTINATION_JOURNAL", "0") == "1"
+JOURNAL_COMPACT_THRESHOLD = int(os.environ.get("JOURNAL_COMPACT_THRESHOLD", "1000"))
+
+# On-disk format of the destination catalog for the "json" backend: "json"
+# (db/destinations.py) or "binary", a memory-mapped file at DESTINATION_BINARY_PATH
+# with an Id index, created from db/destinations.py on first use. Binary mode
+# rewrites the file on every change and does not use the journal.
+DESTINATION_FORMAT = os.environ.get("DESTINATION_FORMAT", "json")
+DESTINATION_BINARY_PATH = os.environ.get("DESTINATION_BINARY_PATH", os.path.join("db", "destinations.bin"))
+
+# GET /destination streams the catalog instead of caching it once the snapshot
+# file reaches this size (0 disables); clients can also ask with ?stream=1
+DESTINATION_STREAM_MIN_BYTES = int(os.environ.get("DESTINATION_STREAM_MIN_BYTES", str(64 * 1024 * 1024)))
+
+# Key used to sign login tokens, and how long a token stays valid
+JWT_SECRET = os.environ.get("JWT_SECRET", "secret")
+if "JWT_SECRET" not in os.environ and os.environ.get("FLASK_DEBUG") != "1":
+    logging.getLogger(__name__).warning(
+        "JWT_SECRET is not set; login tokens are signed with an insecure development key"
+    )
+JWT_EXPIRES_SECONDS = int(os.environ.get("JWT_EXPIRES_SECONDS", "3600"))
+
+# Verified tokens are cached (LRU, by token digest) to skip repeated signature
+# checks; entries live for at most TOKEN_CACHE_TTL seconds and never past "exp"
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = int(os.environ.get("TOKEN_CACHE_TTL", "300"))
+
+# Password hashing (PBKDF2-SHA256) runs on a bounded pool of worker threads;
+# requests beyond PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE are turned away
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", "600000"))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", "16"))
+
+# ASGI mode (asgi.py): Flask views and each chunk of a streamed response run on
+# this many worker threads; reading requests and writing responses stays on the event loop
+ASGI_WORKERS = int(os.environ.get("ASGI_WORKERS", "32"))
+
+# Serve Swagger UI and the API spec (set SWAGGER=0 to skip flasgger entirely);
+# compiled specs are stored in SWAGGER_SPEC_DIR, one file per source hash
+SWAGGER_ENABLED = os.environ.get("SWAGGER", "1") == "1"
+SWAGGER_SPEC_DIR = os.environ.get("SWAGGER_SPEC_DIR", ".apispec")
+
+# Serve request latency histograms and storage/token counters at /metrics
+# (Prometheus text format, per process); set METRICS=0 to turn it off
+METRICS_ENABLED = os.environ.get("METRICS", "1") == "1"
+
+# Opt-in request profiling: with PROFILE=1, requests carrying an X-Profile header
+# signed with PROFILE_SECRET (see `python -m utility.profiling`), plus a random
+# PROFILE_SAMPLE_RATE fraction of all requests, are run under cProfile and dumped
+# to PROFILE_DIR as <time>-<method>-<route>-<status>-<duration>ms.prof
+PROFILE_ENABLED = os.environ.get("PROFILE", "0") == "1"
+PROFILE_SECRET = os.environ.get("PROFILE_SECRET")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+
+# Indentation of the JSON data files (users, destinations); 0 writes them compact,
+# which is smaller and, like 2, uses orjson when it is installed
+STORAGE_JSON_INDENT = int(os.environ.get("STORAGE_JSON_INDENT", "4"))
+
+# Compress JSON and text responses of at least COMPRESSION_MIN_BYTES for clients
+# that send Accept-Encoding: gzip always, brotli and zstd when their packages
+# are installed. The cached catalog body is compressed once per catalog version.
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION", "1") == "1"
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+
+# Admission control for the expensive routes, keyed on "METHOD /rule". "concurrency"
+# caps the requests a process runs at once (503 beyond it); "rate" (per second) and
+# "burst" size a token bucket per client IP and per email (429 when empty). Override
+# with ADMISSION_LIMITS as a JSON object in the same shape, or turn off with ADMISSION=0.
+ADMISSION_ENABLED = os.environ.get("ADMISSION", "1") == "1"
+ADMISSION_LIMITS = json.loads(os.environ.get("ADMISSION_LIMITS", "null")) or {
+    "POST /register": {"concurrency": 4, "rate": 1, "burst": 5},
+    "POST /login": {"concurrency": 8, "rate": 2, "burst": 10},
+    "PATCH /profile": {"concurrency": 4, "rate": 2, "burst": 10},
+    "POST /destination": {"concurrency": 4, "rate": 10, "burst": 50},
+    "POST /destination/bulk": {"concurrency": 1, "rate": 0.5, "burst": 5},
+    "DELETE /destination/<id>": {"concurrency": 4, "rate": 10, "burst": 50},
+}
@@ -1,69 +1,154 @@
-from flask import jsonify, request # type: ignore
-from model.destination import read_destination, write_destination
-from utility.jwt import verify_token
-from model.user import read_users
+from flask import current_app, jsonify, request, stream_with_context # type: ignore
+import config
+from model.destination import catalog_version, read_destination_body, should_stream_catalog, stream_destination_body, query_destinations, search_destinations, insert_destination, insert_destinations, remove_destination
+from model.records import Destination, InvalidRecord
+from utility import compression
+from utility.auth import require_role
+from utility.http import not_modified
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 1000
+
+def _parse_id(value):
+    try:
+        return int(value)
+    except ValueError:
+        return value
 
 def get_all_destinations():
+    if any(param in request.args for param in ("limit", "cursor", "Location", "Name")):
+        return get_destination_page()
     try:
-        destination = read_destination()
-        return jsonify(destination), 200
+        version = catalog_version()
+        cached = not_modified(version)
+        if cached:
+            return cached
+        encoding = None
+        if request.args.get("stream") == "1" or should_stream_catalog():
+            body = stream_with_context(stream_destination_body())
+        else:
+            body = read_destination_body()
+            encoding = compression.negotiate() if len(body) >= config.COMPRESSION_MIN_BYTES else None
+            if encoding:
+                body = read_destination_body(encoding)
+        response = current_app.response_class(body, status=200, mimetype="application/json")
+        response.set_etag(version)
+        if encoding:
+            compression.mark_encoded(response, encoding)
+        return response
     except Exception:
         return jsonify({"error": "Unable to load destination data"}), 500
 
-def add_destination():
-    jwt_token = request.headers.get("Authorization", "").replace("Bearer ", "")
-    logined_user_email = verify_token(jwt_token)
+def get_destination_page():
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
 
-    if not logined_user_email:
-        return jsonify({"message": "Unauthorized Access"}), 401
+    cursor = request.args.get("cursor")
+    try:
+        destinations, next_cursor = query_destinations(
+            limit,
+            cursor=_parse_id(cursor) if cursor else None,
+            location=request.args.get("Location"),
+            name_prefix=request.args.get("Name"),
+        )
+    except Exception:
+        return jsonify({"error": "Unable to load destination data"}), 500
+    return jsonify({"destinations": destinations, "next_cursor": next_cursor}), 200
 
-    users = read_users()
-    for user in users:
-        if user['email'] == logined_user_email:
-            if user['role'] != "admin":
-                return jsonify({"error": "Forbidden Access"}), 403
-            break
-    else:
-        return jsonify({"message": "Unauthorized Access"}), 401
+def search_destination():
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Search query q is required"}), 400
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
 
-    destinations = read_destination()
-    data = request.get_json()
+    try:
+        destinations = search_destinations(query, limit)
+    except Exception:
+        return jsonify({"error": "Unable to load destination data"}), 500
+    return jsonify({"destinations": destinations}), 200
 
-    required_fields = ['Id', 'Name', 'Description', 'Location']
-    if not all(field in data for field in required_fields):
-        return jsonify({"error": "Id, Name, Description, and Location are required"}), 400
+@require_role("admin")
+def add_destination():
+    try:
+        destination = Destination.from_json(request.get_json())
+    except InvalidRecord as error:
+        return jsonify({"error": str(error)}), 400
 
-    if any(destination['Id'] == data['Id'] for destination in destinations):
+    if not insert_destination(destination):
         return jsonify({"error": "Id already taken, please provide a unique id"}), 409
 
-    destinations.append(data)
-    write_destination(destinations)
-
     return jsonify({"message": "Destination added successfully"}), 201
 
+def _read_bulk_records():
+    """Yield (line, record or error) pairs from an NDJSON or JSON array request body"""
+    if request.mimetype == "application/json":
+        try:
+            records = current_app.json.loads(request.get_data())
+        except ValueError:
+            yield 1, ValueError("Body is not valid JSON")
+            return
+        if not isinstance(records, list):
+            yield 1, ValueError("Body must be a JSON array")
+            return
+        yield from enumerate(records, start=1)
+        return
+
+    for line_number, line in enumerate(request.stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, current_app.json.loads(line)
+        except ValueError:
+            yield line_number, ValueError("Line is not valid JSON")
+
+@require_role("admin")
+def bulk_import_destinations():
+    destinations = []
+    lines = {}
+    errors = []
+    for line_number, record in _read_bulk_records():
+        if isinstance(record, ValueError):
+            errors.append({"line": line_number, "error": str(record)})
+            continue
+        try:
+            destination = Destination.from_json(record)
+        except InvalidRecord as error:
+            errors.append({"line": line_number, "error": str(error)})
+            continue
+        if destination.Id in lines:
+            errors.append({"line": line_number, "error": f"Duplicate Id {destination.Id} (first seen on line {lines[destination.Id]})"})
+        else:
+            lines[destination.Id] = line_number
+            destinations.append(destination)
+
+    if not errors and not destinations:
+        return jsonify({"error": "No destinations provided"}), 400
+    if not errors:
+        taken = insert_destinations(destinations)
+        errors = [{"line": lines[taken_id], "error": "Id already taken, please provide a unique id"} for taken_id in taken]
+    if errors:
+        errors.sort(key=lambda error: error["line"])
+        return jsonify({"error": "No destinations were imported", "errors": errors}), 400
+
+    return jsonify({"message": "Destinations imported successfully", "imported": len(destinations)}), 201
+
+@require_role("admin")
 def delete_destination(id):
-    jwt_token = request.headers.get("Authorization", "").replace("Bearer ", "")
-    logined_user_email = verify_token(jwt_token)
-
-    if not logined_user_email:
-        return jsonify({"message": "Unauthorized Access"}), 401
-
-    users = read_users()
-    for user in users:
-        if user['email'] == logined_user_email:
-            if user['role'] != "admin":
-                return jsonify({"error": "Forbidden Access"}), 403
-            break
-    else:
-        return jsonify({"message": "Unauthorized Access"}), 401
-
-    destinations = read_destination()
+    try:
+        destination_id = int(id)
+    except ValueError:
+        return jsonify({"error": "Id must be an integer"}), 400
 
-    destination_to_delete = next((dest for dest in destinations if dest['Id'] == int(id)), None)
-    if not destination_to_delete:
+    if not remove_destination(destination_id):
         return jsonify({"error": "Destination not found"}), 404
 
-    destinations.remove(destination_to_delete)
-    write_destination(destinations)
-
     return jsonify({"message": "Destination deleted successfully"}), 200
@@ -0,0 +1,392 @@
+from flask import Blueprint
+from controller.destination_controller import get_all_destinations, search_destination, add_destination, bulk_import_destinations, delete_destination
+from model.destination import warm_search_index
+
+destination_api = Blueprint("destination", __name__)
+
+# Build the search index when the API is mounted rather than on the first search request
+destination_api.record_once(lambda state: warm_search_index())
+
+@destination_api.route("/", methods=["GET"])
+def home():
+    """
+    Home Page
+    ---
+    tags:
+      - General
+    responses:
+      200:
+        description: Welcome message
+        schema:
+          type: string
+          example: "Welcome destination"
+    """
+    return "Welcome to the destination API"
+
+@destination_api.route("/destination", methods=["GET"])
+def get_destination():
+    """
+    Retrieve Destination Information
+    ---
+    tags:
+      - Destination
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-1000). Passing any of limit, cursor, Location or Name returns a page object instead of the full list
+        example: 20
+      - name: cursor
+        in: query
+        type: integer
+        required: false
+        description: Return destinations with an Id after this one (the next_cursor of the previous page)
+        example: 99997
+      - name: Location
+        in: query
+        type: string
+        required: false
+        description: Only return destinations in this location
+        example: "USA"
+      - name: Name
+        in: query
+        type: string
+        required: false
+        description: Only return destinations whose Name starts with this prefix (case-insensitive)
+        example: "Gra"
+      - name: stream
+        in: query
+        type: integer
+        required: false
+        description: Set to 1 to stream the full catalog in chunks (large catalogs are always streamed)
+        example: 1
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag of a previously fetched catalog; returns 304 if it has not changed
+    responses:
+      200:
+        description: Successfully retrieved the destination data (a page object with destinations and next_cursor when paginating)
+        schema:
+          type: object
+          properties:
+            Id:
+              type: integer
+              example: 99997
+            Name:
+              type: string
+              example: "Grand Canyon"
+            Description:
+              type: string
+              example: "A massive natural wonder in the USA, renowned for its stunning landscapes, hiking trails, and geological formations."
+            Location:
+              type: string
+              example: "USA"
+      304:
+        description: The catalog has not changed since the given ETag
+      400:
+        description: Bad request (invalid limit)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "limit must be an integer"
+      500:
+        description: Internal Server Error (e.g., file not found or unreadable)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Unable to load destination data"
+    """
+    return get_all_destinations()
+
+@destination_api.route("/destination/search", methods=["GET"])
+def find_destination():
+    """
+    Search Destinations
+    ---
+    tags:
+      - Destination
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Words to look for in Name, Description and Location; the last word also matches as a prefix
+        example: "grand can"
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Maximum number of results (1-1000, default 20)
+        example: 20
+    responses:
+      200:
+        description: Matching destinations, best match first
+        schema:
+          type: object
+          properties:
+            destinations:
+              type: array
+              items:
+                type: object
+                properties:
+                  Id:
+                    type: integer
+                    example: 99997
+                  Name:
+                    type: string
+                    example: "Grand Canyon"
+                  Description:
+                    type: string
+                    example: "A massive natural wonder in the USA, renowned for its stunning landscapes, hiking trails, and geological formations."
+                  Location:
+                    type: string
+                    example: "USA"
+      400:
+        description: Bad request (missing query or invalid limit)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Search query q is required"
+    """
+    return search_destination()
+
+@destination_api.route("/destination", methods=["POST"])
+def add_new_destination():
+    """
+    Add a new destination
+    ---
+    tags:
+      - Destination
+    parameters:
+      - name: Authorization
+        in: header
+        type: string
+        required: true
+        description: JWT token for user authentication
+        example: "Bearer <your_token>"
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            Id:
+              type: integer
+              description: Unique identifier for the destination
+              example: 99997
+            Name:
+              type: string
+              description: Name of the destination
+              example: Grand Canyon
+            Description:
+              type: string
+              description: Detailed description of the destination
+              example: "A massive natural wonder in the USA, renowned for its stunning landscapes, hiking trails, and geological formations."
+            Location:
+              type: string
+              description: Geographical location of the destination
+              example: "USA"
+    responses:
+      201:
+        description: Destination added successfully
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Destination Add successfully"
+      400:
+        description: Bad request (missing or invalid data)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Id, Location, Description and Location are required"
+      401:
+        description: Unauthorized access (user not found or not admin)
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Unauthorized Access"
+      403:
+        description: Forbidden access (only admins can add destinations)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Forbidden Access"
+      409:
+        description: Conflict (duplicate Id)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Id already taken please provide unique id"
+    """
+    return add_destination()
+
+@destination_api.route("/destination/bulk", methods=["POST"])
+def import_destinations():
+    """
+    Import many destinations at once
+    ---
+    tags:
+      - Destination
+    consumes:
+      - application/x-ndjson
+      - application/json
+    parameters:
+      - name: Authorization
+        in: header
+        type: string
+        required: true
+        description: JWT token for user authentication
+        example: "Bearer <your_token>"
+      - name: body
+        in: body
+        required: true
+        description: One destination object per line (application/x-ndjson), or a JSON array of destinations (application/json)
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              Id:
+                type: integer
+                example: 99997
+              Name:
+                type: string
+                example: Grand Canyon
+              Description:
+                type: string
+                example: "A massive natural wonder in the USA, renowned for its stunning landscapes, hiking trails, and geological formations."
+              Location:
+                type: string
+                example: "USA"
+    responses:
+      201:
+        description: All destinations imported in a single write
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Destinations imported successfully"
+            imported:
+              type: integer
+              example: 50000
+      400:
+        description: Nothing was imported; errors lists every rejected line
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "No destinations were imported"
+            errors:
+              type: array
+              items:
+                type: object
+                properties:
+                  line:
+                    type: integer
+                    example: 3
+                  error:
+                    type: string
+                    example: "Id already taken, please provide a unique id"
+      401:
+        description: Unauthorized access (user not found or not admin)
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Unauthorized Access"
+      403:
+        description: Forbidden access (only admins can import destinations)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Forbidden Access"
+    """
+    return bulk_import_destinations()
+
+@destination_api.route("/destination/<id>", methods=["DELETE"])
+def remove_destination(id):
+    """
+    Delete a destination
+    ---
+    tags:
+      - Destination
+    parameters:
+      - name: Authorization
+        in: header
+        type: string
+        required: true
+        description: JWT token for user authentication
+        example: "Bearer <your_token>"
+      - name: id
+        in: path
+        type: integer
+        required: true
+        description: The ID of the destination to delete
+        example: 99997
+    responses:
+      200:
+        description: Destination deleted successfully
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Destination deleted successfully"
+      400:
+        description: Bad request (invalid or missing ID)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Invalid ID provided"
+      401:
+        description: Unauthorized access (user not found or not admin)
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Unauthorized Access"
+      403:
+        description: Forbidden access (only admins can delete destinations)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Forbidden Access"
+      404:
+        description: Not found (destination does not exist)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Destination not found"
+    """
+    return delete_destination(id)
@@ -1,6 +1,15 @@
+import hashlib
 from flask import request, jsonify
-from model.user import register_user, authenticate_user, update_user_info, read_users, user_exists
-from utility.jwt import create_jwt, verify_token
+from model.records import InvalidRecord
+from model.user import register_user, authenticate_user, update_user_info, user_exists
+from utility.jwt import create_jwt
+from utility.auth import current_user, require_user
+from utility.http import not_modified
+from utility.password import PasswordHashBusy
+
+
+def _busy():
+    return jsonify({"error": "Server is busy, please try again"}), 503, {"Retry-After": "1"}
 
 
 def home():
@@ -15,11 +24,16 @@ def register():
 
     if not username or not email or not password:
         return jsonify({"error": "Username, Email and password are required"}), 400
+    if not all(isinstance(value, str) for value in (username, email, password)):
+        return jsonify({"error": "Username, Email and password must be strings"}), 400
 
     if user_exists(username=username, email=email):
         return jsonify({"error": "Username or Email already taken"}), 400
 
-    register_user(username, email, password)
+    try:
+        register_user(username, email, password)
+    except PasswordHashBusy:
+        return _busy()
     return jsonify({"message": "User registered successfully"}), 201
 
 
@@ -30,47 +44,51 @@ def login():
 
     if not email or not password:
         return jsonify({"error": "Email and password are required"}), 400
+    if not isinstance(email, str) or not isinstance(password, str):
+        return jsonify({"error": "Email and password must be strings"}), 400
 
-    user = authenticate_user(email, password)
+    try:
+        user = authenticate_user(email, password)
+    except PasswordHashBusy:
+        return _busy()
     if user:
-        create_jwt(email)
-        return jsonify({"message": "User logged in successfully"}), 201
+        token = create_jwt(email)
+        return jsonify({"message": "User logged in successfully", "token": token}), 201
 
     return jsonify({"message": "Email or Password is not correct"}), 400
 
 
+@require_user
 def get_profile():
-    jwt_token = request.headers.get("Authorization", "").replace("Bearer ", "")
-    logined_user_email = verify_token(jwt_token)
-
-    if not logined_user_email:
-        return jsonify({"error": "Invalid or expired token"}), 401
-
-    users = read_users()
-    for user in users:
-        if user['email'] == logined_user_email:
-            return jsonify({
-                "username": user['username'],
-                "email": user['email'],
-                "password": user['password'],
-                "role": user['role']
-            }), 200
-
-    return jsonify({"error": "User not found"}), 404
-
-
+    user = current_user()
+    profile = (user.username, user.email, user.role)
+    etag = hashlib.sha1(repr(profile).encode()).hexdigest()[:20]
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    response = jsonify({
+        "username": user.username,
+        "email": user.email,
+        "role": user.role
+    })
+    response.set_etag(etag)
+    return response, 200
+
+
+@require_user
 def update_profile():
-    jwt_token = request.headers.get("Authorization", "").replace("Bearer ", "")
-    logined_user_email = verify_token(jwt_token)
-
-    if not logined_user_email:
-        return jsonify({"error": "Invalid or expired token"}), 401
+    logined_user_email = current_user().email
 
     data = request.get_json()
     if not data or data.get('email') != logined_user_email:
         return jsonify({"error": "Forbidden Access"}), 403
 
-    updated_user = update_user_info(logined_user_email, data)
+    try:
+        updated_user = update_user_info(logined_user_email, data)
+    except PasswordHashBusy:
+        return _busy()
+    except InvalidRecord as error:
+        return jsonify({"error": str(error)}), 400
     if updated_user:
         return jsonify({"message": "User Information updated successfully"}), 201
     return jsonify({"error": "User not found"}), 404
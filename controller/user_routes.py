@@ -0,0 +1,257 @@
+from flask import Blueprint
+from controller.user_controller import home, register, login, get_profile, update_profile
+
+user_api = Blueprint("user", __name__)
+
+@user_api.route("/", methods=["GET"])
+def index():
+    """
+    Home Page
+    ---
+    tags:
+      - Welcome
+    responses:
+      200:
+        description: Returns a welcome message
+        examples:
+          text/plain: "Welcome to User"
+    """
+    return home()
+
+
+@user_api.route('/register', methods=['POST'])
+def register_user():
+    """
+    User Registration
+    ---
+    tags:
+      - User Management
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            username:
+              type: string
+              description: Desired username
+              example: johndoe
+            email:
+              type: string
+              description: User's email address
+              example: johndoe@example.com
+            password:
+              type: string
+              description: User's password
+              example: "password123"
+    responses:
+      201:
+        description: User registered successfully
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "User registered successfully"
+      400:
+        description: Input validation error or duplicate username/email
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Username, Email and password are required"
+      503:
+        description: Too many password hashes queued; retry after the Retry-After delay
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Server is busy, please try again"
+    """
+    return register()
+
+
+@user_api.route("/login", methods=["POST"])
+def login_user():
+    """
+    User Login
+    ---
+    tags:
+      - User Management
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            email:
+              type: string
+              description: User's email address
+              example: johndoe@example.com
+            password:
+              type: string
+              description: User's password
+              example: password123
+    responses:
+      201:
+        description: Login successful
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "User logined successfully"
+            token:
+              type: string
+              description: 'JWT to send as "Authorization: Bearer <token>"; expires after JWT_EXPIRES_SECONDS'
+              example: "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
+      400:
+        description: Login failed (e.g., missing credentials or incorrect login details)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Email and password are required"
+            message:
+              type: string
+              example: "Email or Password is not correct"
+      503:
+        description: Too many password hashes queued; retry after the Retry-After delay
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Server is busy, please try again"
+    """
+    return login()
+
+
+@user_api.route('/profile', methods=['GET'])
+def view_profile():
+    """
+    Get User Profile
+    ---
+    tags:
+      - User Management
+    parameters:
+      - name: Authorization
+        in: header
+        type: string
+        required: true
+        description: JWT token for user authentication
+        example: "Bearer <your_token>"
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag of a previously fetched profile; returns 304 if it has not changed
+    responses:
+      200:
+        description: User profile retrieved successfully
+        schema:
+          type: object
+          properties:
+            username:
+              type: string
+              example: johndoe
+            email:
+              type: string
+              example: johndoe@example.com
+            role:
+              type: string
+              example: user
+      304:
+        description: The profile has not changed since the given ETag
+      404:
+        description: User not found
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "User not found"
+      401:
+        description: Unauthorized access
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Invalid or expired token"
+    """
+    return get_profile()
+
+
+@user_api.route('/profile', methods=['PATCH'])
+def edit_profile():
+    """
+    Update User Profile
+    ---
+    tags:
+      - User Management
+    parameters:
+      - name: Authorization
+        in: header
+        type: string
+        required: true
+        description: JWT token for user authentication
+        example: "Bearer <your_token>"
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            email:
+              type: string
+              description: The user's email (must match the logged-in user)
+              example: johndoe@example.com
+            username:
+              type: string
+              description: Updated username
+              example: john_updated
+            password:
+              type: string
+              description: Updated password
+              example: newpassword123
+    responses:
+      201:
+        description: User information updated successfully
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "User Information Update successfully"
+      403:
+        description: Forbidden access (email mismatch)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Forbidden Access"
+      404:
+        description: User not found
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "User not found"
+      400:
+        description: Bad request (missing or invalid data)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Bad request"
+    """
+    return update_profile()
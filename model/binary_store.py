@@ -0,0 +1,339 @@
+"""Destination catalog in a compact binary file, read through mmap
+
+Layout (all integers little-endian):
+
+    header    magic, generation, count, offsets_start, ids_start, ordinals_start
+    records   one encoded record after another, in insertion order
+    offsets   count x u64: where each record starts
+    ids       count x i64: every Id, sorted
+    ordinals  count x u64: the record number of each sorted Id
+
+A record is a u16 field count followed by the fields, each a u16-length
+key, a one-byte type tag and the value: nothing for null/true/false, an
+i64 or f64, or a u32-length UTF-8 string (JSON text for lists, objects and
+integers beyond 64 bits).
+
+Looking up one Id is a binary search over the ids section plus one record
+decode, so it touches a handful of pages; every worker process maps the
+same file and shares the page cache. Writes go through a new file renamed
+over the old one, copying the encoded records across without decoding them.
+"""
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from model.records import Destination
+from utility import jsoncodec
+from utility.storage import atomic_write_bytes, file_signature, load_json, locked
+
+MAGIC = b"DSTCAT\x00\x01"
+_HEADER = struct.Struct("<8sQQQQQ")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_NULL, _TRUE, _FALSE, _INT, _FLOAT, _STR, _JSON = range(7)
+_I64_MIN, _I64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _encode_record(record):
+    parts = [_U16.pack(len(record))]
+    for key, value in record.items():
+        key = key.encode()
+        parts.append(_U16.pack(len(key)))
+        parts.append(key)
+        if value is None:
+            parts.append(_U8.pack(_NULL))
+        elif value is True or value is False:
+            parts.append(_U8.pack(_TRUE if value else _FALSE))
+        elif isinstance(value, int) and _I64_MIN <= value <= _I64_MAX:
+            parts.append(_U8.pack(_INT) + _I64.pack(value))
+        elif isinstance(value, float):
+            parts.append(_U8.pack(_FLOAT) + _F64.pack(value))
+        else:
+            tag, data = (_STR, value.encode()) if isinstance(value, str) else (_JSON, jsoncodec.dumpb(value))
+            parts.append(_U8.pack(tag) + _U32.pack(len(data)))
+            parts.append(data)
+    return b"".join(parts)
+
+
+def _decode_record(buffer, offset):
+    (fields,) = _U16.unpack_from(buffer, offset)
+    offset += 2
+    record = {}
+    for _ in range(fields):
+        (length,) = _U16.unpack_from(buffer, offset)
+        offset += 2
+        key = buffer[offset:offset + length].decode()
+        tag = buffer[offset + length]
+        offset += length + 1
+        if tag == _NULL:
+            value = None
+        elif tag == _TRUE or tag == _FALSE:
+            value = tag == _TRUE
+        elif tag == _INT:
+            (value,) = _I64.unpack_from(buffer, offset)
+            offset += 8
+        elif tag == _FLOAT:
+            (value,) = _F64.unpack_from(buffer, offset)
+            offset += 8
+        else:
+            (length,) = _U32.unpack_from(buffer, offset)
+            data = buffer[offset + 4:offset + 4 + length]
+            offset += 4 + length
+            value = data.decode() if tag == _STR else jsoncodec.loads(data)
+        record[key] = value
+    return record
+
+
+def _record_id(destination):
+    destination_id = destination.Id
+    if not isinstance(destination_id, int) or isinstance(destination_id, bool) or not _I64_MIN <= destination_id <= _I64_MAX:
+        raise ValueError(f"Binary catalog Ids must be 64-bit integers, got {destination_id!r}")
+    return destination_id
+
+
+class _Mapping:
+    """One version of the catalog file, mapped read-only"""
+
+    def __init__(self, path, signature):
+        self.signature = signature
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.generation, self.count, self.offsets_start, self.ids_start, self.ordinals_start = \
+            _HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary destination catalog")
+
+    def offset(self, ordinal):
+        return _U64.unpack_from(self.buffer, self.offsets_start + ordinal * 8)[0]
+
+    def record(self, ordinal):
+        return Destination.from_stored(_decode_record(self.buffer, self.offset(ordinal)))
+
+    def raw(self, ordinal):
+        """The encoded bytes of one record"""
+        end = self.offset(ordinal + 1) if ordinal + 1 < self.count else self.offsets_start
+        return self.buffer[self.offset(ordinal):end]
+
+    def sorted_id(self, position):
+        return _I64.unpack_from(self.buffer, self.ids_start + position * 8)[0]
+
+    def sorted_ordinal(self, position):
+        return _U64.unpack_from(self.buffer, self.ordinals_start + position * 8)[0]
+
+    def bisect(self, destination_id):
+        """Position of the first sorted Id >= destination_id"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.sorted_id(middle) < destination_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, destination_id):
+        """Record number of this Id, or None"""
+        position = self.bisect(destination_id)
+        if position < self.count and self.sorted_id(position) == destination_id:
+            return self.sorted_ordinal(position)
+        return None
+
+    def sections(self):
+        """(record offsets, sorted Ids, their record numbers) as lists"""
+        unpack = lambda code, start: list(struct.unpack_from(f"<{self.count}{code}", self.buffer, start))
+        return unpack("Q", self.offsets_start), unpack("q", self.ids_start), unpack("Q", self.ordinals_start)
+
+
+def _write_file(path, generation, records, offsets, ids, ordinals):
+    """Write a catalog file; records is the encoded record bytes, starting right after the header"""
+    count = len(offsets)
+    offsets_start = _HEADER.size + len(records)
+    ids_start = offsets_start + count * 8
+    ordinals_start = ids_start + count * 8
+    atomic_write_bytes(path, b"".join((
+        _HEADER.pack(MAGIC, generation, count, offsets_start, ids_start, ordinals_start),
+        records,
+        struct.pack(f"<{count}Q", *offsets),
+        struct.pack(f"<{count}q", *ids),
+        struct.pack(f"<{count}Q", *ordinals),
+    )))
+
+
+def _encode_all(destinations, start=_HEADER.size):
+    """Encode records to follow a region ending at start; returns (bytes, offsets, Ids)"""
+    parts, offsets, ids = [], [], []
+    position = start
+    for destination in destinations:
+        ids.append(_record_id(destination))
+        data = _encode_record(destination.to_dict())
+        parts.append(data)
+        offsets.append(position)
+        position += len(data)
+    return b"".join(parts), offsets, ids
+
+
+class BinaryStore:
+    """Destinations stored in a binary catalog file, with the interface of SqliteStore's destination half"""
+
+    name = "binary"
+
+    def __init__(self, path):
+        self.path = path
+        self._mapping = None
+        self._mapping_lock = threading.Lock()
+        self._catalog = None
+        self._catalog_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+    def _current(self):
+        """Map the file, again only when it has been replaced since the last call"""
+        signature = file_signature(self.path)
+        with self._mapping_lock:
+            if self._mapping is None or self._mapping.signature != signature:
+                # The old mapping is left to the garbage collector: other threads may still be reading it
+                self._mapping = _Mapping(self.path, signature)
+            return self._mapping
+
+    def catalog_version(self):
+        return self._current().generation
+
+    def load_catalog(self):
+        """Return every destination, decoded once per catalog version"""
+        mapping = self._current()
+        with self._catalog_lock:
+            catalog = self._catalog
+            if catalog is not None and catalog["version"] == mapping.generation:
+                self.cache_stats["hits"] += 1
+                return catalog
+            self.cache_stats["misses"] += 1
+            self._catalog = {
+                "version": mapping.generation,
+                "destinations": [mapping.record(ordinal) for ordinal in range(mapping.count)],
+                "body": None,
+            }
+            return self._catalog
+
+    def iter_destinations(self):
+        mapping = self._current()
+        for ordinal in range(mapping.count):
+            yield mapping.record(ordinal)
+
+    def get_destination(self, destination_id):
+        mapping = self._current()
+        ordinal = mapping.find(destination_id)
+        return None if ordinal is None else mapping.record(ordinal)
+
+    def query_destinations(self, limit, cursor=None, location=None, name_prefix=None):
+        if cursor is not None and not isinstance(cursor, int):
+            # Text sorts after every integer Id, as in the JSON backend
+            return []
+        mapping = self._current()
+        prefix = name_prefix.casefold() if name_prefix else None
+        page = []
+        position = 0 if cursor is None else mapping.bisect(cursor + 1)
+        while position < mapping.count and len(page) < limit:
+            destination = mapping.record(mapping.sorted_ordinal(position))
+            position += 1
+            if location is not None and destination.Location != location:
+                continue
+            if prefix and not destination.Name.casefold().startswith(prefix):
+                continue
+            page.append(destination)
+        return page
+
+    def write_destinations(self, destinations):
+        with self._write_lock, locked(self.path):
+            generation = self._current().generation + 1 if os.path.exists(self.path) else 1
+            self._write_all(destinations, generation)
+            return generation
+
+    def _write_all(self, destinations, generation):
+        records, offsets, ids = _encode_all(destinations)
+        if len(set(ids)) != len(ids):
+            raise ValueError("Binary catalog Ids must be unique")
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        _write_file(self.path, generation, records, offsets, [ids[i] for i in order], order)
+
+    def insert_destination(self, destination):
+        """Insert one destination and return the new catalog version, or None if the Id is taken"""
+        taken, version = self.insert_destinations([destination])
+        return None if taken else version
+
+    def insert_destinations(self, destinations):
+        """Append destinations in one write; returns (taken Ids, new version or None)"""
+        with self._write_lock, locked(self.path):
+            mapping = self._current()
+            taken = [destination.Id for destination in destinations
+                     if isinstance(destination.Id, int) and mapping.find(destination.Id) is not None]
+            if taken:
+                return taken, None
+            offsets, ids, ordinals = mapping.sections()
+            records, new_offsets, new_ids = _encode_all(destinations, mapping.offsets_start)
+            if len(set(new_ids)) != len(new_ids):
+                raise ValueError("Binary catalog Ids must be unique")
+            for ordinal, destination_id in enumerate(new_ids, start=mapping.count):
+                position = bisect_left(ids, destination_id)
+                ids.insert(position, destination_id)
+                ordinals.insert(position, ordinal)
+            _write_file(self.path, mapping.generation + 1, mapping.buffer[_HEADER.size:mapping.offsets_start] + records,
+                        offsets + new_offsets, ids, ordinals)
+            return [], mapping.generation + 1
+
+    def delete_destination(self, destination_id):
+        """Delete one destination and return the new catalog version, or None if there is none"""
+        if not isinstance(destination_id, int):
+            return None
+        with self._write_lock, locked(self.path):
+            mapping = self._current()
+            removed = mapping.find(destination_id)
+            if removed is None:
+                return None
+            offsets, ids, ordinals = mapping.sections()
+            start = offsets[removed]
+            size = len(mapping.raw(removed))
+            del offsets[removed]
+            offsets[removed:] = [offset - size for offset in offsets[removed:]]
+            position = bisect_left(ids, destination_id)
+            del ids[position], ordinals[position]
+            ordinals = [ordinal - 1 if ordinal > removed else ordinal for ordinal in ordinals]
+            records = mapping.buffer[_HEADER.size:start] + mapping.buffer[start + size:mapping.offsets_start]
+            _write_file(self.path, mapping.generation + 1, records, offsets, ids, ordinals)
+            return mapping.generation + 1
+
+    def migrate_from_json(self, destinations_path):
+        """Create the catalog file from the JSON catalog unless it exists; returns whether it did"""
+        with self._write_lock, locked(self.path):
+            if os.path.exists(self.path):
+                return False
+            stored = load_json(destinations_path) if os.path.exists(destinations_path) else []
+            self._write_all([Destination.from_stored(destination) for destination in stored], 1)
+            return True
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path, json_path):
+    """Return the store for this catalog file, converting json_path on first use"""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = BinaryStore(path)
+            store.migrate_from_json(json_path)
+            _stores[path] = store
+        return store
+
+
+if __name__ == "__main__":
+    import config
+
+    store = get_store(config.DESTINATION_BINARY_PATH, os.path.join("db", "destinations.py"))
+    print(f"{store.path}: {store._current().count} destinations, generation {store.catalog_version()}")
@@ -1,5 +1,15 @@
 import os
 import json
+import hashlib
+import threading
+from bisect import bisect_right
+import config
+from model import binary_store, sqlite_store
+from model.records import Destination
+from utility import compression, jsoncodec
+from utility.search import SearchIndex
+from utility.metrics import timed
+from utility.storage import file_signature, locked, atomic_write_json, append_journal, read_journal, iter_json_array, load_json
 
 destination_file_path = os.path.join("db", "destinations.py")
 
@@ -8,12 +18,439 @@ if not os.path.exists(destination_file_path):
     with open(destination_file_path, "w") as file:
         json.dump([], file)
 
+# Parsed catalog, keyed on the path and file signature it was read from
+_catalog = None
+_catalog_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+_write_lock = threading.Lock()
+_compaction_running = threading.Event()
+
+# Full-text index over the catalog, tagged with the catalog version it reflects
+SEARCH_FIELDS = ('Name', 'Description', 'Location')
+_search = {"version": None, "index": None, "builder": None}
+_search_lock = threading.Lock()
+
+
+def _store():
+    """Return the SQLite or binary catalog store when one is configured, None for the JSON file"""
+    if config.STORAGE_BACKEND == "sqlite":
+        return sqlite_store.get_store()
+    if config.DESTINATION_FORMAT == "binary":
+        return binary_store.get_store(config.DESTINATION_BINARY_PATH, destination_file_path)
+    return None
+
+
+def _journal_path():
+    return os.path.splitext(destination_file_path)[0] + ".journal"
+
+
+def _signature():
+    """Identify the on-disk state: the snapshot file, plus the journal in journal mode"""
+    signature = file_signature(destination_file_path)
+    if config.DESTINATION_JOURNAL and signature is not None:
+        return (signature, file_signature(_journal_path()))
+    return signature
+
+
+def _replay(destinations, records):
+    """Apply journal records to a snapshot; re-applying a record is harmless"""
+    by_id = {destination.Id: destination for destination in destinations}
+    for record in records:
+        if record["op"] == "add":
+            if record["destination"]['Id'] not in by_id:
+                by_id[record["destination"]['Id']] = Destination.from_stored(record["destination"])
+        elif record["op"] == "delete":
+            by_id.pop(record["Id"], None)
+    return list(by_id.values())
+
+
+def _set_catalog(destinations, journal_records=0):
+    global _catalog
+    with _catalog_lock:
+        _catalog = {
+            "path": destination_file_path,
+            "signature": _signature(),
+            "destinations": destinations,
+            "body": None,
+            "journal_records": journal_records,
+        }
+
+
+def _load_catalog():
+    """Return the cached catalog, re-reading the file only when it has changed"""
+    global _catalog
+    signature = _signature()
+    with _catalog_lock:
+        catalog = _catalog
+        if (catalog is not None and signature is not None
+                and catalog["path"] == destination_file_path
+                and catalog["signature"] == signature):
+            _cache_stats["hits"] += 1
+            return catalog
+
+        _cache_stats["misses"] += 1
+        # Read the journal before the snapshot: compaction replaces the snapshot
+        # before truncating the journal, so this order never loses a record.
+        records = read_journal(_journal_path()) if config.DESTINATION_JOURNAL else []
+        destinations = [Destination.from_stored(destination) for destination in load_json(destination_file_path)]
+        if records:
+            destinations = _replay(destinations, records)
+        _catalog = {
+            "path": destination_file_path,
+            "signature": signature,
+            "destinations": destinations,
+            "body": None,
+            "journal_records": len(records),
+        }
+        return _catalog
+
+
+@timed("load_destinations")
+def _current_catalog():
+    backend = _store()
+    return backend.load_catalog() if backend else _load_catalog()
+
+
+def catalog_version():
+    """Return a tag that changes whenever the catalog does, without reading it"""
+    backend = _store()
+    if backend:
+        return f"{backend.name}-{backend.catalog_version()}"
+    state = repr((destination_file_path, _signature()))
+    return hashlib.sha1(state.encode()).hexdigest()[:20]
+
+
+def _serialize(destinations):
+    """Serialize the catalog the same way jsonify does outside debug mode"""
+    return jsoncodec.dumps(destinations, sort_keys=True) + "\n"
+
+
 # Read destinations
 def read_destination():
-    with open(destination_file_path, "r") as file:
-        return json.load(file)
+    """Return a copy of the catalog list; the records themselves are shared and must not be mutated"""
+    return list(_current_catalog()["destinations"])
+
+
+def read_destination_body(encoding=None):
+    """Return the catalog as a pre-serialized JSON response body, compressed once per version if asked"""
+    catalog = _current_catalog()
+    if catalog["body"] is None:
+        catalog["body"] = _serialize(catalog["destinations"])
+    if encoding is None:
+        return catalog["body"]
+    encoded = catalog.setdefault("encoded", {})
+    if encoding not in encoded:
+        encoded[encoding] = compression.compress(catalog["body"].encode(), encoding, reused=True)
+    return encoded[encoding]
+
+
+def should_stream_catalog():
+    """Whether the catalog is large enough to be streamed rather than cached"""
+    if config.STORAGE_BACKEND == "sqlite" or not config.DESTINATION_STREAM_MIN_BYTES:
+        return False
+    binary = config.DESTINATION_FORMAT == "binary"
+    signature = file_signature(config.DESTINATION_BINARY_PATH if binary else destination_file_path)
+    return signature is not None and signature[1] >= config.DESTINATION_STREAM_MIN_BYTES
+
+
+def _iter_destinations():
+    backend = _store()
+    if backend:
+        return backend.iter_destinations()
+    if config.DESTINATION_JOURNAL:
+        return _iter_journaled_destinations()
+    return map(Destination.from_stored, iter_json_array(destination_file_path))
+
+
+def _iter_journaled_destinations():
+    """Stream the snapshot, applying the journal on the fly in the same order as _replay"""
+    # Journal before snapshot, as in _load_catalog
+    records = read_journal(_journal_path())
+    deleted = {record["Id"] for record in records if record["op"] == "delete"}
+    touched = deleted.union(record["destination"]['Id'] for record in records if record["op"] == "add")
+    in_snapshot = set()
+    for destination in iter_json_array(destination_file_path):
+        if destination['Id'] in touched:
+            in_snapshot.add(destination['Id'])
+        if destination['Id'] not in deleted:
+            yield Destination.from_stored(destination)
+
+    appended = {}
+    for record in records:
+        if record["op"] == "add":
+            destination_id = record["destination"]['Id']
+            if destination_id not in in_snapshot:
+                appended.setdefault(destination_id, record["destination"])
+        elif record["op"] == "delete":
+            in_snapshot.discard(record["Id"])
+            appended.pop(record["Id"], None)
+    yield from map(Destination.from_stored, appended.values())
+
+
+def stream_destination_body(chunk_size=64 * 1024):
+    """Yield the catalog as a JSON array in chunks, parsing the file incrementally"""
+    yield "["
+    chunk = []
+    size = 0
+    separator = ""
+    for destination in _iter_destinations():
+        item = separator + jsoncodec.dumps(destination, sort_keys=True)
+        separator = ","
+        chunk.append(item)
+        size += len(item)
+        if size >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    chunk.append("]\n")
+    yield "".join(chunk)
+
+
+def _id_key(destination_id):
+    """Sort key for Ids: numbers first in numeric order, then anything else as text"""
+    if isinstance(destination_id, (int, float)) and not isinstance(destination_id, bool):
+        return (0, destination_id, "")
+    return (1, 0, str(destination_id))
+
+
+def _catalog_index(catalog):
+    """Return the Id and Location indexes for a catalog, building them on first use"""
+    index = catalog.get("index")
+    if index is None:
+        by_id = {destination.Id: destination for destination in catalog["destinations"]}
+        ids = sorted(by_id, key=_id_key)
+        by_location = {}
+        for destination_id in ids:
+            by_location.setdefault(by_id[destination_id].Location, []).append(destination_id)
+        index = {
+            "by_id": by_id,
+            "ids": (ids, [_id_key(destination_id) for destination_id in ids]),
+            "by_location": {
+                location: (location_ids, [_id_key(destination_id) for destination_id in location_ids])
+                for location, location_ids in by_location.items()
+            },
+        }
+        catalog["index"] = index
+    return index
+
+
+def query_destinations(limit, cursor=None, location=None, name_prefix=None):
+    """Return one page of destinations ordered by Id, and the cursor for the next page
+
+    Results start after the `cursor` Id; `location` matches exactly and
+    `name_prefix` matches the start of Name, ignoring case.
+    """
+    backend = _store()
+    if backend:
+        page = backend.query_destinations(limit + 1, cursor, location, name_prefix)
+    else:
+        index = _catalog_index(_current_catalog())
+        if location is None:
+            ids, keys = index["ids"]
+        else:
+            ids, keys = index["by_location"].get(location, ([], []))
+        start = 0 if cursor is None else bisect_right(keys, _id_key(cursor))
+        prefix = name_prefix.casefold() if name_prefix else None
+
+        page = []
+        for position in range(start, len(ids)):
+            destination = index["by_id"][ids[position]]
+            if prefix and not destination.Name.casefold().startswith(prefix):
+                continue
+            page.append(destination)
+            if len(page) > limit:
+                break
+
+    if len(page) > limit:
+        return page[:limit], page[limit - 1].Id
+    return page, None
+
 
 # Write destinations
+@timed("write_destination")
 def write_destination(destination):
-    with open(destination_file_path, "w") as file:
-        json.dump(destination, file, indent=4)
+    backend = _store()
+    if backend:
+        backend.write_destinations(destination)
+        return
+    with locked(destination_file_path):
+        atomic_write_json(destination_file_path, destination)
+        if config.DESTINATION_JOURNAL:
+            open(_journal_path(), "w").close()
+        _set_catalog(list(destination))
+
+
+def _journal_change(catalog, records, destinations):
+    """Append changes to the journal and apply them to the cached catalog"""
+    append_journal(_journal_path(), records)
+    journal_records = catalog["journal_records"] + len(records)
+    _set_catalog(destinations, journal_records)
+    if journal_records >= config.JOURNAL_COMPACT_THRESHOLD and not _compaction_running.is_set():
+        _compaction_running.set()
+        threading.Thread(target=_background_compaction, daemon=True).start()
+
+
+@timed("insert_destination")
+def insert_destination(destination):
+    """Add a single destination, returning False if its Id is already taken"""
+    backend = _store()
+    if backend:
+        version = backend.insert_destination(destination)
+        if not version:
+            return False
+        _update_search_index(f"{backend.name}-{version - 1}", f"{backend.name}-{version}", lambda index: index.add(destination.Id, destination))
+        return True
+    with _write_lock, locked(destination_file_path):
+        catalog = _load_catalog()
+        destinations = catalog["destinations"]
+        if any(existing.Id == destination.Id for existing in destinations):
+            return False
+        previous_version = catalog_version()
+        if config.DESTINATION_JOURNAL:
+            _journal_change(catalog, [{"op": "add", "destination": destination}], destinations + [destination])
+        else:
+            write_destination(destinations + [destination])
+        _update_search_index(previous_version, catalog_version(), lambda index: index.add(destination.Id, destination))
+    return True
+
+
+@timed("insert_destinations")
+def insert_destinations(new_destinations):
+    """Add several destinations in a single write
+
+    Returns the Ids that are already taken; if there are any, nothing is written.
+    """
+    def add_all(index):
+        for destination in new_destinations:
+            index.add(destination.Id, destination)
+
+    backend = _store()
+    if backend:
+        taken, version = backend.insert_destinations(new_destinations)
+        if version:
+            _update_search_index(f"{backend.name}-{version - 1}", f"{backend.name}-{version}", add_all)
+        return taken
+    with _write_lock, locked(destination_file_path):
+        catalog = _load_catalog()
+        destinations = catalog["destinations"]
+        existing_ids = {existing.Id for existing in destinations}
+        taken = [destination.Id for destination in new_destinations if destination.Id in existing_ids]
+        if taken:
+            return taken
+        previous_version = catalog_version()
+        if config.DESTINATION_JOURNAL:
+            records = [{"op": "add", "destination": destination} for destination in new_destinations]
+            _journal_change(catalog, records, destinations + list(new_destinations))
+        else:
+            write_destination(destinations + list(new_destinations))
+        _update_search_index(previous_version, catalog_version(), add_all)
+    return []
+
+
+@timed("remove_destination")
+def remove_destination(destination_id):
+    """Delete the destination with this Id, returning False if there is none"""
+    backend = _store()
+    if backend:
+        version = backend.delete_destination(destination_id)
+        if not version:
+            return False
+        _update_search_index(f"{backend.name}-{version - 1}", f"{backend.name}-{version}", lambda index: index.remove(destination_id))
+        return True
+    with _write_lock, locked(destination_file_path):
+        catalog = _load_catalog()
+        destinations = catalog["destinations"]
+        remaining = [existing for existing in destinations if existing.Id != destination_id]
+        if len(remaining) == len(destinations):
+            return False
+        previous_version = catalog_version()
+        if config.DESTINATION_JOURNAL:
+            _journal_change(catalog, [{"op": "delete", "Id": destination_id}], remaining)
+        else:
+            write_destination(remaining)
+        _update_search_index(previous_version, catalog_version(), lambda index: index.remove(destination_id))
+    return True
+
+
+def compact_destinations():
+    """Fold the journal into a new db/destinations.py snapshot"""
+    with _write_lock, locked(destination_file_path):
+        previous_version = catalog_version()
+        write_destination(read_destination())
+        _update_search_index(previous_version, catalog_version(), None)
+
+
+def _update_search_index(previous_version, version, change):
+    """Apply a local write to the search index if it was in sync with the catalog before it
+
+    version is the catalog version the write produced, not the current one:
+    a concurrent write may already have moved the catalog further, and the
+    index must not claim to include it.
+    """
+    with _search_lock:
+        if _search["index"] is None or _search["version"] != previous_version:
+            return
+        if change:
+            change(_search["index"])
+        _search["version"] = version
+
+
+def _build_search_index():
+    """Index the current catalog off the request path, repeating if it changed meanwhile"""
+    try:
+        while True:
+            version = catalog_version()
+            index = SearchIndex.build(_current_catalog()["destinations"], SEARCH_FIELDS)
+            with _search_lock:
+                _search["index"] = index
+                _search["version"] = version
+                if catalog_version() == version:
+                    return
+    finally:
+        with _search_lock:
+            _search["builder"] = None
+
+
+def warm_search_index():
+    """Start a background build of the search index unless it is current or already building"""
+    with _search_lock:
+        builder = _search["builder"]
+        if builder is None and (_search["index"] is None or _search["version"] != catalog_version()):
+            builder = _search["builder"] = threading.Thread(target=_build_search_index, daemon=True)
+            builder.start()
+        return builder
+
+
+def search_destinations(query, limit=20):
+    """Return destinations matching the query, best match first
+
+    A stale index keeps answering while a fresh one is built in the background;
+    only the very first search waits for a build.
+    """
+    builder = warm_search_index()
+    with _search_lock:
+        index = _search["index"]
+    if index is None:
+        builder.join()
+        with _search_lock:
+            index = _search["index"]
+        if index is None:
+            # The background build failed; build here so the error reaches the caller
+            index = SearchIndex.build(_current_catalog()["destinations"], SEARCH_FIELDS)
+    return index.search(query, limit)
+
+
+def _background_compaction():
+    try:
+        compact_destinations()
+    finally:
+        _compaction_running.clear()
+
+
+def catalog_cache_stats():
+    """Return the catalog cache hit/miss counters"""
+    backend = _store()
+    if backend:
+        return dict(backend.cache_stats)
+    with _catalog_lock:
+        return dict(_cache_stats)
@@ -0,0 +1,97 @@
+"""Record types for destinations and users
+
+Records are slotted dataclasses rather than dicts: a quarter of the memory
+per record, and a fixed set of fields. Client payloads go through
+`from_json`, which accepts exactly those fields with the right types;
+records read back from storage go through `from_stored`, which never
+rejects data that is already on disk.
+"""
+from dataclasses import dataclass, replace
+
+
+class InvalidRecord(ValueError):
+    """A client payload that does not describe a valid record"""
+
+
+def is_valid_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_fields(cls, data, allowed):
+    if not isinstance(data, dict):
+        raise InvalidRecord(f"{cls.__name__} must be a JSON object")
+    unknown = sorted(str(field) for field in data if field not in allowed)
+    if unknown:
+        raise InvalidRecord(f"Unknown field(s): {', '.join(unknown)}")
+
+
+def _check_text(data, names):
+    for name in names:
+        if name in data and (not isinstance(data[name], str) or not data[name].strip()):
+            raise InvalidRecord(f"{name} must be a non-empty string")
+
+
+@dataclass(slots=True)
+class Destination:
+    """A catalog entry; instances are shared between requests and must not be mutated"""
+
+    Id: int
+    Name: str
+    Description: str
+    Location: str
+
+    @classmethod
+    def from_json(cls, data):
+        """Validate a client payload, raising InvalidRecord with the message to return"""
+        if not isinstance(data, dict) or not all(field in data for field in cls.__slots__):
+            raise InvalidRecord("Id, Name, Description, and Location are required")
+        if not is_valid_id(data['Id']):
+            raise InvalidRecord("Id must be an integer")
+        _check_fields(cls, data, cls.__slots__)
+        _check_text(data, ('Name', 'Description', 'Location'))
+        return cls(data['Id'], data['Name'], data['Description'], data['Location'])
+
+    @classmethod
+    def from_stored(cls, data):
+        """Build a record from stored data; text fields missing from older records read as empty"""
+        try:
+            return cls(**data)
+        except TypeError:
+            return cls(data.get('Id'), data.get('Name', ""), data.get('Description', ""), data.get('Location', ""))
+
+    def to_dict(self):
+        return {'Id': self.Id, 'Name': self.Name, 'Description': self.Description, 'Location': self.Location}
+
+
+@dataclass(slots=True)
+class User:
+    """A registered user; password holds the stored hash"""
+
+    username: str
+    email: str
+    password: str
+    role: str = "user"
+
+    @classmethod
+    def from_stored(cls, data):
+        try:
+            return cls(**data)
+        except TypeError:
+            return cls(data.get('username', ""), data.get('email', ""), data.get('password', ""), data.get('role', "user"))
+
+    # Fields users may change on their own profile; role is not one of them
+    EDITABLE = ('username', 'email', 'password')
+
+    @classmethod
+    def check_changes(cls, changes):
+        """Raise InvalidRecord unless changes only replaces editable fields with text"""
+        _check_fields(cls, changes, cls.EDITABLE)
+        _check_text(changes, cls.EDITABLE)
+
+    def updated(self, changes):
+        """Return a copy with the given fields replaced, raising InvalidRecord for bad changes"""
+        self.check_changes(changes)
+        return replace(self, **changes)
+
+    def to_dict(self):
+        return {'username': self.username, 'email': self.email, 'password': self.password, 'role': self.role}
@@ -0,0 +1,269 @@
+import os
+import sqlite3
+import threading
+import config
+from model.records import Destination, User
+from utility import jsoncodec
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT,
+    username TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+CREATE INDEX IF NOT EXISTS users_username ON users (username);
+
+CREATE TABLE IF NOT EXISTS destinations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    Id INTEGER NOT NULL,
+    Name TEXT,
+    Location TEXT,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS destinations_id ON destinations (Id);
+CREATE INDEX IF NOT EXISTS destinations_location ON destinations (Location, Id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SqliteStore:
+    """Users and destinations stored in SQLite, one connection per thread"""
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._catalog = None
+        self._catalog_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # Users
+
+    def read_users(self):
+        rows = self.connection().execute("SELECT data FROM users ORDER BY seq")
+        return [User.from_stored(jsoncodec.loads(data)) for (data,) in rows]
+
+    def write_users(self, users):
+        with self.connection() as conn:
+            conn.execute("DELETE FROM users")
+            conn.executemany(
+                "INSERT INTO users (email, username, data) VALUES (?, ?, ?)",
+                [(user.email, user.username, jsoncodec.dumps(user)) for user in users],
+            )
+
+    def _find_user(self, column, value):
+        row = self.connection().execute(
+            f"SELECT data FROM users WHERE {column} = ? ORDER BY seq LIMIT 1", (value,)
+        ).fetchone()
+        return User.from_stored(jsoncodec.loads(row[0])) if row else None
+
+    def find_user_by_email(self, email):
+        return self._find_user("email", email)
+
+    def find_user_by_username(self, username):
+        return self._find_user("username", username)
+
+    def insert_user(self, user):
+        with self.connection() as conn:
+            conn.execute(
+                "INSERT INTO users (email, username, data) VALUES (?, ?, ?)",
+                (user.email, user.username, jsoncodec.dumps(user)),
+            )
+
+    def update_user(self, email, new_data):
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT seq, data FROM users WHERE email = ? ORDER BY seq LIMIT 1", (email,)
+            ).fetchone()
+            if row is None:
+                return None
+            user = User.from_stored(jsoncodec.loads(row[1])).updated(new_data)
+            conn.execute(
+                "UPDATE users SET email = ?, username = ?, data = ? WHERE seq = ?",
+                (user.email, user.username, jsoncodec.dumps(user), row[0]),
+            )
+            return user
+
+    # Destinations
+
+    def _bump_catalog_version(self, conn):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('destinations_version', '1') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+        row = conn.execute("SELECT value FROM meta WHERE key = 'destinations_version'").fetchone()
+        return int(row[0])
+
+    def catalog_version(self):
+        row = self.connection().execute(
+            "SELECT value FROM meta WHERE key = 'destinations_version'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def load_catalog(self):
+        """Return the cached catalog entry, re-querying only when the version has changed"""
+        version = self.catalog_version()
+        with self._catalog_lock:
+            catalog = self._catalog
+            if catalog is not None and catalog["version"] == version:
+                self.cache_stats["hits"] += 1
+                return catalog
+            self.cache_stats["misses"] += 1
+            rows = self.connection().execute("SELECT data FROM destinations ORDER BY seq")
+            self._catalog = {
+                "version": version,
+                "destinations": [Destination.from_stored(jsoncodec.loads(data)) for (data,) in rows],
+                "body": None,
+            }
+            return self._catalog
+
+    def iter_destinations(self):
+        for (data,) in self.connection().execute("SELECT data FROM destinations ORDER BY seq"):
+            yield Destination.from_stored(jsoncodec.loads(data))
+
+    def query_destinations(self, limit, cursor=None, location=None, name_prefix=None):
+        clauses, params = [], []
+        if cursor is not None:
+            clauses.append("Id > ?")
+            params.append(cursor)
+        if location is not None:
+            clauses.append("Location = ?")
+            params.append(location)
+        if name_prefix:
+            escaped = name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("Name LIKE ? ESCAPE '\\'")
+            params.append(escaped + "%")
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = self.connection().execute(
+            f"SELECT data FROM destinations {where}ORDER BY Id LIMIT ?", params + [limit]
+        )
+        return [Destination.from_stored(jsoncodec.loads(data)) for (data,) in rows]
+
+    def write_destinations(self, destinations):
+        with self.connection() as conn:
+            conn.execute("DELETE FROM destinations")
+            conn.executemany(
+                "INSERT INTO destinations (Id, Name, Location, data) VALUES (?, ?, ?, ?)",
+                [_destination_row(destination) for destination in destinations],
+            )
+            self._bump_catalog_version(conn)
+
+    def insert_destination(self, destination):
+        """Insert one destination and return the new catalog version, or None if the Id is taken"""
+        try:
+            with self.connection() as conn:
+                conn.execute(
+                    "INSERT INTO destinations (Id, Name, Location, data) VALUES (?, ?, ?, ?)",
+                    _destination_row(destination),
+                )
+                return self._bump_catalog_version(conn)
+        except sqlite3.IntegrityError:
+            return None
+
+    def insert_destinations(self, destinations):
+        """Insert destinations in one transaction; returns (taken Ids, new version or None)"""
+        ids = [destination.Id for destination in destinations]
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            taken = []
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                taken.extend(
+                    row[0] for row in conn.execute(f"SELECT Id FROM destinations WHERE Id IN ({placeholders})", batch)
+                )
+            if taken:
+                return taken, None
+            conn.executemany(
+                "INSERT INTO destinations (Id, Name, Location, data) VALUES (?, ?, ?, ?)",
+                [_destination_row(destination) for destination in destinations],
+            )
+            return [], self._bump_catalog_version(conn)
+
+    def delete_destination(self, destination_id):
+        """Delete one destination and return the new catalog version, or None if there is none"""
+        with self.connection() as conn:
+            deleted = conn.execute("DELETE FROM destinations WHERE Id = ?", (destination_id,)).rowcount
+            if not deleted:
+                return None
+            return self._bump_catalog_version(conn)
+
+    # Migration
+
+    def _migrated(self, conn):
+        return conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone() is not None
+
+    def migrate_from_json(self, users_path, destinations_path):
+        """Import the JSON files once; later calls, from any process, are no-ops"""
+        conn = self.connection()
+        if self._migrated(conn):
+            return False
+        users = [User.from_stored(user) for user in _read_json(users_path)]
+        destinations = [Destination.from_stored(destination) for destination in _read_json(destinations_path)]
+        with conn:
+            # Another process may have migrated since the check above
+            conn.execute("BEGIN IMMEDIATE")
+            if self._migrated(conn):
+                return False
+            conn.executemany(
+                "INSERT INTO users (email, username, data) VALUES (?, ?, ?)",
+                [(user.email, user.username, jsoncodec.dumps(user)) for user in users],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO destinations (Id, Name, Location, data) VALUES (?, ?, ?, ?)",
+                [_destination_row(destination) for destination in destinations],
+            )
+            self._bump_catalog_version(conn)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_json', '1')")
+        return True
+
+
+def _destination_row(destination):
+    return (destination.Id, destination.Name, destination.Location, jsoncodec.dumps(destination))
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as file:
+        return jsoncodec.loads(file.read())
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    """Return the store for the configured database, migrating the JSON files on first use"""
+    path = config.SQLITE_PATH
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = SqliteStore(path)
+            store.migrate_from_json(os.path.join("db", "users.py"), os.path.join("db", "destinations.py"))
+            _stores[path] = store
+        return store
+
+
+if __name__ == "__main__":
+    store = get_store()
+    print(f"{config.SQLITE_PATH}: {len(store.read_users())} users, "
+          f"{len(store.load_catalog()['destinations'])} destinations")
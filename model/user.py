@@ -1,6 +1,13 @@
 import os
 import json
+import threading
+import config
+from model import sqlite_store
+from model.records import User
 from utility.jwt import create_jwt, verify_token
+from utility.password import hash_password, check_password, burn_password_check
+from utility.metrics import timed
+from utility.storage import file_signature, locked, atomic_write_json, load_json
 
 user_file_path = os.path.join("db", "users.py")
 
@@ -9,51 +16,165 @@ if not os.path.exists(user_file_path):
     with open(user_file_path, "w") as file:
         json.dump([], file)
 
+# Parsed users plus email/username indexes, keyed on the file they were read from
+_store = None
+_store_lock = threading.RLock()
+
+
+def _sqlite():
+    """Return the SQLite store when it is the configured backend"""
+    if config.STORAGE_BACKEND == "sqlite":
+        return sqlite_store.get_store()
+    return None
+
+
+def _index(store, user):
+    """Add a user to the lookup maps, keeping the first entry for duplicate keys"""
+    store["by_email"].setdefault(user.email, user)
+    store["by_username"].setdefault(user.username, user)
+
+
+def _build_store(users, signature):
+    store = {
+        "path": user_file_path,
+        "signature": signature,
+        "users": users,
+        "by_email": {},
+        "by_username": {},
+    }
+    for user in users:
+        _index(store, user)
+    return store
+
+
+@timed("load_users")
+def _load_store():
+    """Return the indexed user store, re-reading the file only when it has changed"""
+    global _store
+    signature = file_signature(user_file_path)
+    with _store_lock:
+        store = _store
+        if (store is not None and signature is not None
+                and store["path"] == user_file_path
+                and store["signature"] == signature):
+            return store
+        _store = _build_store([User.from_stored(user) for user in load_json(user_file_path)], signature)
+        return _store
+
+
+@timed("save_users")
+def _save(users):
+    """Write users to disk and return the new file signature"""
+    atomic_write_json(user_file_path, users)
+    return file_signature(user_file_path)
+
 
 def read_users():
     """Simulates reading users from a data source"""
-    with open(user_file_path, "r") as file:
-        return json.load(file)
+    backend = _sqlite()
+    if backend:
+        return backend.read_users()
+    return list(_load_store()["users"])
 
 
 def write_users(users):
     """Simulates writing users to a data source"""
-    with open(user_file_path, "w") as file:
-        json.dump(users, file, indent=4)
+    global _store
+    backend = _sqlite()
+    if backend:
+        backend.write_users(users)
+        return
+    with _store_lock, locked(user_file_path):
+        users = list(users)
+        _store = _build_store(users, _save(users))
+
+
+@timed("find_user")
+def find_user_by_email(email):
+    """Return the user registered with this email, or None"""
+    if not isinstance(email, str):
+        return None
+    backend = _sqlite()
+    if backend:
+        return backend.find_user_by_email(email)
+    return _load_store()["by_email"].get(email)
+
+
+@timed("find_user")
+def find_user_by_username(username):
+    """Return the user registered with this username, or None"""
+    if not isinstance(username, str):
+        return None
+    backend = _sqlite()
+    if backend:
+        return backend.find_user_by_username(username)
+    return _load_store()["by_username"].get(username)
 
 
 def user_exists(username=None, email=None):
     """Check if a user already exists by username or email"""
-    users = read_users()
-    for user in users:
-        if user['username'] == username or user['email'] == email:
-            return True
-    return False
+    if _sqlite():
+        return bool(find_user_by_username(username) or find_user_by_email(email))
+    store = _load_store()
+    return ((isinstance(username, str) and username in store["by_username"])
+            or (isinstance(email, str) and email in store["by_email"]))
 
 
+@timed("register_user")
 def register_user(username, email, password):
     """Register a new user"""
-    users = read_users()
-    users.append({"username": username, "email": email, "password": password, "role": "user"})
-    write_users(users)
+    user = User(username, email, hash_password(password))
+    backend = _sqlite()
+    if backend:
+        backend.insert_user(user)
+        return
+    with _store_lock, locked(user_file_path):
+        store = _load_store()
+        users = store["users"] + [user]
+        store["signature"] = _save(users)
+        store["users"] = users
+        _index(store, user)
 
 
 def authenticate_user(email, password):
-    """Authenticate user login"""
-    users = read_users()
-    for user in users:
-        if user['email'] == email and user['password'] == password:
-            return user
-    return None
+    """Authenticate user login, re-hashing plaintext or outdated passwords on success"""
+    user = find_user_by_email(email)
+    if not user:
+        burn_password_check(password)
+        return None
+    matches, new_hash = check_password(password, user.password)
+    if not matches:
+        return None
+    if new_hash:
+        user = _update_user(email, {"password": new_hash}) or user
+    return user
 
 
 def update_user_info(email, new_data):
-    """Update user's information"""
-    users = read_users()
-    for user in users:
-        if user['email'] == email:
-            for key, value in new_data.items():
-                user[key] = value
-            write_users(users)
-            return user
-    return None
+    """Update user's information, raising InvalidRecord for unknown fields or non-text values"""
+    User.check_changes(new_data)
+    if 'password' in new_data:
+        new_data = dict(new_data, password=hash_password(new_data['password']))
+    return _update_user(email, new_data)
+
+
+@timed("update_user")
+def _update_user(email, new_data):
+    backend = _sqlite()
+    if backend:
+        return backend.update_user(email, new_data)
+    with _store_lock, locked(user_file_path):
+        store = _load_store()
+        user = store["by_email"].get(email)
+        if user is None:
+            return None
+
+        updated = user.updated(new_data)
+        users = [updated if entry is user else entry for entry in store["users"]]
+        store["signature"] = _save(users)
+        store["users"] = users
+        for field, index in (('email', store["by_email"]), ('username', store["by_username"])):
+            if index.get(getattr(user, field)) is user:
+                del index[getattr(user, field)]
+            index.setdefault(getattr(updated, field), updated)
+        return updated
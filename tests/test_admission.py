@@ -0,0 +1,106 @@
+import threading
+import pytest
+import config
+import utility.auth as auth
+from flask import Flask
+from utility import admission
+from utility.admission import TokenBucket
+
+
+def test_token_bucket_refills():
+    """Test a bucket allows its burst, then one request per 1/rate seconds."""
+    bucket = TokenBucket(rate=2, burst=3)
+
+    assert [bucket.take("a", now=0) for _ in range(3)] == [0, 0, 0]
+    assert bucket.take("a", now=0) == pytest.approx(0.5)
+    assert bucket.take("b", now=0) == 0
+    assert bucket.take("a", now=0.6) == 0
+
+
+def test_token_bucket_keeps_recent_keys():
+    """Test the least recently used buckets are dropped past max_keys."""
+    bucket = TokenBucket(rate=1, burst=1, max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        bucket.take(key, now=0)
+
+    assert set(bucket._buckets) == {"a", "c"}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # The token is the email it was issued for
+    monkeypatch.setattr(auth, "verify_token", lambda token: token or None)
+    monkeypatch.setattr(auth, "find_user_by_email", lambda email: None)
+    app = Flask(__name__)
+    app.add_url_rule("/profile", "profile", lambda: ("ok", 200), methods=["PATCH"])
+    app.add_url_rule("/cheap", "cheap", lambda: ("ok", 200))
+    admission.init_app(app, {"PATCH /profile": {"rate": 1, "burst": 2}})
+    return app
+
+
+def _update(client, email, ip, body=None):
+    headers = {"Authorization": f"Bearer {email}"} if email else {}
+    return client.patch("/profile", json=body or {}, headers=headers, environ_base={"REMOTE_ADDR": ip})
+
+
+def test_rate_limit_per_ip_and_email(app):
+    """Test an IP or a token's email over its bucket gets a 429 with Retry-After, other routes do not."""
+    client = app.test_client()
+    assert [_update(client, "a@x.com", "10.0.0.1").status_code, _update(client, "b@x.com", "10.0.0.1").status_code] == [200, 200]
+
+    limited = _update(client, "c@x.com", "10.0.0.1")
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "1"
+    assert _update(client, "a@x.com", "10.0.0.2").status_code == 200
+    assert _update(client, "A@x.com", "10.0.0.3").status_code == 429
+    assert client.get("/cheap", environ_base={"REMOTE_ADDR": "10.0.0.1"}).status_code == 200
+
+
+def test_body_email_is_not_a_rate_limit_key(app):
+    """Test requests naming an account in the body from many IPs cannot lock that account out."""
+    client = app.test_client()
+    for i in range(5):
+        assert _update(client, None, f"10.0.1.{i}", {"email": "victim@x.com"}).status_code == 200
+    assert _update(client, "victim@x.com", "10.0.2.1").status_code == 200
+
+
+def test_concurrency_limit_sheds_excess():
+    """Test requests beyond the concurrency limit get an immediate 503 and the slot is freed afterwards."""
+    started, finish = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        finish.wait(5)
+        return "done"
+
+    app = Flask(__name__)
+    app.add_url_rule("/slow", "slow", slow)
+    admission.init_app(app, {"GET /slow": {"concurrency": 1}})
+    first = []
+    worker = threading.Thread(target=lambda: first.append(app.test_client().get("/slow").status_code))
+    worker.start()
+    started.wait(5)
+
+    busy = app.test_client().get("/slow")
+    finish.set()
+    worker.join()
+
+    assert busy.status_code == 503 and busy.headers["Retry-After"] == "1"
+    assert first == [200]
+    assert app.test_client().get("/slow").status_code == 200
+
+
+def test_limits_apply_to_the_real_apps(monkeypatch):
+    """Test create_app installs the configured limits on the API routes."""
+    from application import create_app
+    from controller.user_routes import user_api
+
+    monkeypatch.setattr(config, "SWAGGER_ENABLED", False)
+    monkeypatch.setattr(config, "ADMISSION_LIMITS", {"POST /login": {"rate": 0.01, "burst": 1}})
+    client = create_app(user_api).test_client()
+    client.post("/login", json={})
+
+    response = client.post("/login", json={})
+    assert response.status_code == 429
+    assert response.json == {"error": "Too many requests, please slow down"}
+    assert int(response.headers["Retry-After"]) >= 99
@@ -0,0 +1,44 @@
+import os
+import pytest
+import config
+from application import create_app
+from utility.apispec import CachedSwagger
+
+
+@pytest.fixture
+def spec_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SWAGGER_SPEC_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_spec_is_compiled_once_and_reused(spec_dir, mocker):
+    """Test a second process reads the stored spec instead of parsing docstrings."""
+    first = create_app().test_client().get("/apispec_1.json")
+    assert first.status_code == 200
+    assert "/destination/search" in first.json["paths"]
+    assert len(os.listdir(spec_dir)) == 1
+
+    parse = mocker.spy(CachedSwagger, "get_apispecs")
+    second = create_app().test_client().get("/apispec_1.json")
+
+    assert parse.call_count == 0
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_spec_revalidates_with_etag(spec_dir):
+    """Test a client holding the current spec gets a 304."""
+    client = create_app().test_client()
+    etag = client.get("/apispec_1.json").headers["ETag"]
+
+    assert client.get("/apispec_1.json", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_swagger_can_be_disabled(spec_dir, monkeypatch):
+    """Test SWAGGER=0 serves the APIs without any docs routes."""
+    monkeypatch.setattr(config, "SWAGGER_ENABLED", False)
+    client = create_app().test_client()
+
+    assert client.get("/apidocs/").status_code == 404
+    assert client.get("/apispec_1.json").status_code == 404
+    assert client.get("/").status_code == 200
@@ -0,0 +1,52 @@
+import json
+import sys
+import pytest
+from flask import Flask
+import application
+import config
+import model.destination as destination_model
+from application import create_app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / "destinations.py"
+    path.write_text(json.dumps([{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(path))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(destination_model, "_search", {"version": None, "index": None, "builder": None})
+    monkeypatch.setattr(config, "SWAGGER_SPEC_DIR", str(tmp_path / "apispec"))
+    with create_app().test_client() as client:
+        yield client
+
+
+def test_combined_app_serves_both_apis(client):
+    """Test one app answers user and destination routes and documents both."""
+    assert client.get("/").data == b"Welcome to User"
+    assert client.post("/login", json={}).status_code == 400
+    assert client.get("/destination").json == [{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]
+    assert {"/register", "/destination/search"} <= set(client.get("/apispec_1.json").json["paths"])
+
+
+def test_single_api_apps_keep_their_routes():
+    """Test the separate-port apps still mount only their own API."""
+    import app
+    import server
+
+    assert {rule.rule for rule in app.app.url_map.iter_rules()} >= {"/register", "/profile"}
+    assert "/destination" not in {rule.rule for rule in app.app.url_map.iter_rules()}
+    assert "/register" not in {rule.rule for rule in server.app.url_map.iter_rules()}
+
+
+def test_combined_app_builds_a_single_flask_app(monkeypatch):
+    """Test the combined app does not also build the single-API apps."""
+    built = []
+    monkeypatch.setattr(application, "Flask", lambda name: built.append(name) or Flask(name))
+    monkeypatch.setattr(config, "SWAGGER_ENABLED", False)
+    monkeypatch.delitem(sys.modules, "app", raising=False)
+    monkeypatch.delitem(sys.modules, "server", raising=False)
+
+    create_app()
+
+    assert len(built) == 1
+    assert "app" not in sys.modules and "server" not in sys.modules
@@ -0,0 +1,53 @@
+import asyncio
+import json
+import pytest
+import model.destination as destination_model
+from application import create_app
+from asgi import AsgiAdapter
+
+
+@pytest.fixture
+def adapter(tmp_path, monkeypatch):
+    path = tmp_path / "destinations.py"
+    path.write_text(json.dumps([{"Id": i, "Name": f"Place {i}", "Description": "City", "Location": "USA"} for i in range(1, 201)]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(path))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(destination_model, "_search", {"version": None, "index": None, "builder": None})
+    return AsgiAdapter(create_app(), workers=2)
+
+
+def _request(adapter, method, path, query=b"", body=b"", headers=()):
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": query, "http_version": "1.1",
+        "headers": [(b"host", b"testserver"), *headers],
+    }
+    chunks = [{"type": "http.request", "body": body[:5], "more_body": True}, {"type": "http.request", "body": body[5:]}]
+    sent = []
+
+    async def receive():
+        return chunks.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(adapter(scope, receive, send))
+    return sent
+
+
+def test_request_and_response_cross_the_adapter(adapter):
+    """Test a JSON body is reassembled and the response is sent back."""
+    sent = _request(adapter, "POST", "/login", body=b'{"email": "x@example.com"}', headers=[(b"content-type", b"application/json")])
+
+    assert sent[0]["status"] == 400
+    assert json.loads(b"".join(message.get("body", b"") for message in sent[1:])) == {"error": "Email and password are required"}
+    assert sent[-1] == {"type": "http.response.body"}
+
+
+def test_streamed_catalog_is_sent_in_chunks(adapter, monkeypatch):
+    """Test a streamed response keeps its request context across worker threads."""
+    sent = _request(adapter, "GET", "/destination", query=b"stream=1")
+    bodies = [message["body"] for message in sent[1:] if message.get("body")]
+
+    assert sent[0]["status"] == 200
+    assert len(bodies) > 1
+    assert len(json.loads(b"".join(bodies))) == 200
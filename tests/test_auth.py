@@ -0,0 +1,58 @@
+import pytest
+from flask import Flask, jsonify
+import utility.auth as auth
+from model.records import User
+from utility.auth import current_user, require_role, require_user
+
+USERS = {
+    "admin@example.com": User("admin", "admin@example.com", "hash", "admin"),
+    "jane@doe.com": User("jane_doe", "jane@doe.com", "hash", "user"),
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    lookups = []
+
+    def find_user_by_email(email):
+        lookups.append(email)
+        return USERS.get(email)
+
+    monkeypatch.setattr(auth, "verify_token", lambda token: token or None)
+    monkeypatch.setattr(auth, "find_user_by_email", find_user_by_email)
+
+    app = Flask(__name__)
+
+    @app.route("/me")
+    @require_user
+    def me():
+        current_user()
+        return jsonify(current_user())
+
+    @app.route("/admin")
+    @require_role("admin")
+    def admin():
+        return jsonify({"ok": True})
+
+    with app.test_client() as client:
+        client.lookups = lookups
+        yield client
+
+
+def test_require_user(client):
+    """Test token, user lookup and a single lookup per request."""
+    assert client.get("/me").status_code == 401
+    assert client.get("/me", headers={"Authorization": "Bearer ghost@example.com"}).status_code == 404
+
+    client.lookups.clear()
+    response = client.get("/me", headers={"Authorization": "Bearer jane@doe.com"})
+    assert response.json["username"] == "jane_doe"
+    assert client.lookups == ["jane@doe.com"]
+
+
+def test_require_role(client):
+    """Test missing users get 401 and other roles get 403."""
+    assert client.get("/admin").status_code == 401
+    assert client.get("/admin", headers={"Authorization": "Bearer ghost@example.com"}).status_code == 401
+    assert client.get("/admin", headers={"Authorization": "Bearer jane@doe.com"}).status_code == 403
+    assert client.get("/admin", headers={"Authorization": "Bearer admin@example.com"}).json == {"ok": True}
@@ -0,0 +1,30 @@
+import json
+import config
+import model.destination as destination_model
+import model.user as user_model
+from benchmarks import run as bench
+
+
+def test_benchmark_reports_every_route(tmp_path, monkeypatch):
+    """Test a tiny client-mode run covers every route without errors and writes JSON."""
+    # The benchmark repoints the models at its own dataset; restore them afterwards
+    for module, names in ((user_model, ("user_file_path", "_store")), (destination_model, ("destination_file_path", "_catalog", "_search"))):
+        for name in names:
+            monkeypatch.setattr(module, name, getattr(module, name))
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", config.PASSWORD_HASH_ITERATIONS)
+    monkeypatch.setattr(config, "ADMISSION_ENABLED", config.ADMISSION_ENABLED)
+    output = tmp_path / "bench.json"
+
+    bench.main(["--sizes", "50", "--mode", "client", "--requests", "3", "--hash-iterations", "1000", "--output", str(output)])
+    results = json.loads(output.read_text())["results"]
+
+    assert [entry["route"] for entry in results] == [name for name, _ in bench._routes(50)]
+    assert all(entry["errors"] == 0 and entry["p99_ms"] >= entry["p50_ms"] for entry in results)
+
+
+def test_percentile_nearest_rank():
+    """Test percentiles pick the nearest-rank sample."""
+    values = list(range(1, 101))
+
+    assert (bench.percentile(values, 50), bench.percentile(values, 95), bench.percentile(values, 99)) == (50, 95, 99)
+    assert bench.percentile([7], 99) == 7
@@ -0,0 +1,88 @@
+import json
+import random
+import pytest
+import config
+import model.destination as destination_model
+from model.records import Destination
+from model import binary_store
+
+
+@pytest.fixture
+def binary_backend(tmp_path, monkeypatch):
+    destinations = tmp_path / "destinations.py"
+    destinations.write_text(json.dumps([
+        {"Id": 2, "Name": "Kyoto", "Description": "City", "Location": "Japan"},
+        {"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"},
+    ]))
+    path = str(tmp_path / "destinations.bin")
+    monkeypatch.setattr(destination_model, "destination_file_path", str(destinations))
+    monkeypatch.setattr(destination_model, "_search", {"version": None, "index": None, "builder": None})
+    monkeypatch.setattr(config, "DESTINATION_FORMAT", "binary")
+    monkeypatch.setattr(config, "DESTINATION_BINARY_PATH", path)
+    monkeypatch.setattr(binary_store, "_stores", {})
+    return path
+
+
+def test_field_values_round_trip():
+    """Test every JSON value type survives encoding."""
+    record = {"Id": -5, "Name": "Zürich ✓", "Score": 4.25, "Open": True, "Closed": False, "Note": None,
+              "Tags": ["a", {"b": 1}], "Big": 2 ** 70, "Description": ""}
+
+    assert binary_store._decode_record(binary_store._encode_record(record), 0) == record
+
+
+def test_records_round_trip(tmp_path):
+    """Test records come back equal, by Id and in file order."""
+    destinations = [Destination(-5, "Zürich ✓", "Lake city", "Switzerland"), Destination(3, "Kyoto", "City", "Japan")]
+    store = binary_store.BinaryStore(str(tmp_path / "catalog.bin"))
+    store.write_destinations(destinations)
+
+    assert store.get_destination(-5) == destinations[0]
+    assert list(store.iter_destinations()) == destinations
+
+
+def test_catalog_is_converted_and_served(binary_backend):
+    """Test the JSON catalog is converted on first use and reads keep its order."""
+    assert [d.Id for d in destination_model.read_destination()] == [2, 1]
+    assert json.loads(destination_model.read_destination_body())[1]["Name"] == "Paris"
+    assert destination_model.query_destinations(1) == ([destination_model.read_destination()[1]], 1)
+    assert destination_model.query_destinations(5, cursor=1, location="Japan")[0][0].Name == "Kyoto"
+    assert destination_model.search_destinations("kyoto")[0].Id == 2
+
+
+def test_writes_keep_the_index_consistent(binary_backend):
+    """Test random inserts and deletes match a dict kept alongside."""
+    expected = {destination.Id: destination for destination in destination_model.read_destination()}
+    rng = random.Random(7)
+    for _ in range(200):
+        destination_id = rng.randrange(-50, 50)
+        if rng.random() < 0.6:
+            destination = Destination(destination_id, f"N{destination_id}", "d", "L")
+            assert destination_model.insert_destination(destination) == (destination_id not in expected)
+            expected.setdefault(destination_id, destination)
+        else:
+            assert destination_model.remove_destination(destination_id) == (expected.pop(destination_id, None) is not None)
+
+    store = binary_store.BinaryStore(binary_backend)
+    assert list(store.iter_destinations()) == list(expected.values())
+    assert all(store.get_destination(destination_id) == destination for destination_id, destination in expected.items())
+    assert [d.Id for d in store.query_destinations(1000)] == sorted(expected)
+
+
+def test_other_processes_see_writes(binary_backend):
+    """Test a second store on the same file picks up the new generation."""
+    other = binary_store.BinaryStore(binary_backend)
+    destination_model.read_destination()
+    version = other.catalog_version()
+
+    assert destination_model.insert_destinations([Destination(3, "Rome", "City", "Italy")]) == []
+    assert other.catalog_version() == version + 1
+    assert other.get_destination(3).Name == "Rome"
+    assert destination_model.catalog_version() == f"binary-{version + 1}"
+
+
+def test_non_integer_ids_are_rejected(tmp_path):
+    """Test Ids that do not fit the index are refused."""
+    store = binary_store.BinaryStore(str(tmp_path / "catalog.bin"))
+    with pytest.raises(ValueError):
+        store.write_destinations([Destination("abc", "Paris", "City", "France")])
@@ -0,0 +1,83 @@
+import json
+import pytest
+from flask import Flask
+import controller.destination_controller as destination_controller
+import model.destination as destination_model
+import utility.auth as auth
+from model.records import User
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / "destinations.py"
+    path.write_text(json.dumps([{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(path))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(auth, "verify_token", lambda token: "admin@example.com")
+    monkeypatch.setattr(auth, "find_user_by_email", lambda email: User("admin", email, "hash", "admin"))
+
+    app = Flask(__name__)
+    app.add_url_rule("/destination/bulk", "bulk", destination_controller.bulk_import_destinations, methods=["POST"])
+    app.add_url_rule("/destination/<id>", "delete", destination_controller.delete_destination, methods=["DELETE"])
+    with app.test_client() as client:
+        yield client
+
+
+def _ndjson(records):
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+def test_bulk_import_ndjson(client):
+    """Test an NDJSON body is imported in one write."""
+    records = [{"Id": i, "Name": f"Place {i}", "Description": "Nice", "Location": "USA"} for i in range(2, 102)]
+    response = client.post("/destination/bulk", data=_ndjson(records), content_type="application/x-ndjson")
+
+    assert response.status_code == 201
+    assert response.json["imported"] == 100
+    assert len(destination_model.read_destination()) == 101
+
+
+def test_bulk_import_json_array(client):
+    """Test a JSON array body is accepted too."""
+    response = client.post("/destination/bulk", json=[{"Id": 2, "Name": "Kyoto", "Description": "City", "Location": "Japan"}])
+
+    assert response.status_code == 201
+    assert [d.Id for d in destination_model.read_destination()] == [1, 2]
+
+
+def test_bulk_import_reports_errors_per_line(client):
+    """Test invalid lines and duplicate Ids reject the whole batch."""
+    body = _ndjson([
+        {"Id": 2, "Name": "Kyoto", "Description": "City", "Location": "Japan"},
+        {"Id": 3, "Description": "No name", "Location": "USA"},
+        {"Id": 2, "Name": "Again", "Description": "City", "Location": "Japan"},
+    ]) + "{not json\n"
+    response = client.post("/destination/bulk", data=body, content_type="application/x-ndjson")
+
+    assert response.status_code == 400
+    assert [error["line"] for error in response.json["errors"]] == [2, 3, 4]
+    assert len(destination_model.read_destination()) == 1
+
+
+def test_bulk_import_rejects_taken_ids(client):
+    """Test Ids already in the catalog are reported against their line."""
+    body = _ndjson([
+        {"Id": 2, "Name": "Kyoto", "Description": "City", "Location": "Japan"},
+        {"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"},
+    ])
+    response = client.post("/destination/bulk", data=body, content_type="application/x-ndjson")
+
+    assert response.status_code == 400
+    assert response.json["errors"] == [{"line": 2, "error": "Id already taken, please provide a unique id"}]
+    assert len(destination_model.read_destination()) == 1
+
+
+def test_non_integer_ids_are_rejected(client):
+    """Test string Ids cannot be imported and a non-integer path Id is a 400."""
+    response = client.post("/destination/bulk", json=[{"Id": "kyoto", "Name": "Kyoto", "Description": "City", "Location": "Japan"}])
+
+    assert response.status_code == 400
+    assert response.json["errors"] == [{"line": 1, "error": "Id must be an integer"}]
+    assert client.delete("/destination/kyoto").status_code == 400
+    assert client.delete("/destination/5").status_code == 404
+    assert client.delete("/destination/1").status_code == 200
@@ -0,0 +1,86 @@
+import gzip
+import json
+import pytest
+import config
+import model.destination as destination_model
+from application import create_app
+from model.records import Destination
+from utility import compression
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    catalog = tmp_path / "destinations.py"
+    catalog.write_text(json.dumps([
+        {"Id": i, "Name": f"Place {i}", "Description": "A long and very compressible description", "Location": "USA"}
+        for i in range(1, 201)
+    ]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(catalog))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(config, "SWAGGER_ENABLED", False)
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", True)
+    monkeypatch.setattr(config, "COMPRESSION_MIN_BYTES", 1024)
+    with create_app().test_client() as client:
+        yield client
+
+
+def test_catalog_is_compressed_once_per_version(client, monkeypatch):
+    """Test the gzip catalog body is built once and reused until the catalog changes."""
+    calls = []
+    compress = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda *args, **kwargs: calls.append(args[1:]) or compress(*args, **kwargs))
+    plain = client.get("/destination")
+
+    first = client.get("/destination", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/destination", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["Vary"]
+    assert gzip.decompress(first.get_data()) == plain.get_data()
+    assert second.get_data() == first.get_data()
+    assert calls == [("gzip",)]
+
+    destination_model.insert_destination(Destination(999, "New", "New place", "USA"))
+    assert json.loads(gzip.decompress(client.get("/destination", headers={"Accept-Encoding": "gzip"}).get_data()))[-1]["Id"] == 999
+    assert calls == [("gzip",), ("gzip",)]
+
+
+def test_compressed_etag_is_weak_and_revalidates(client):
+    """Test the compressed variant carries a weak ETag that still yields 304."""
+    response = client.get("/destination", headers={"Accept-Encoding": "gzip"})
+    etag, weak = response.get_etag()
+
+    assert weak
+    assert client.get("/destination", headers={"Accept-Encoding": "gzip", "If-None-Match": f'W/"{etag}"'}).status_code == 304
+
+
+def test_identity_unless_accepted(client, monkeypatch):
+    """Test clients that do not accept a coding, or refuse it, get plain JSON."""
+    assert "Content-Encoding" not in client.get("/destination").headers
+    assert "Content-Encoding" not in client.get("/destination", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", False)
+    assert "Content-Encoding" not in client.get("/destination", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_other_responses_compressed_per_request(client):
+    """Test large JSON responses are compressed and small ones are left alone."""
+    page = client.get("/destination?limit=100", headers={"Accept-Encoding": "gzip"})
+    small = client.get("/destination?limit=1", headers={"Accept-Encoding": "gzip"})
+
+    assert page.headers["Content-Encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(page.get_data()))["destinations"]) == 100
+    assert "Content-Encoding" not in small.headers
+
+
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+def test_optional_encodings(client, monkeypatch, encoding, module):
+    """Test brotli and zstd are preferred over gzip when installed."""
+    library = pytest.importorskip(module)
+    monkeypatch.setattr(compression, "ENCODINGS", (encoding, "gzip"))
+
+    response = client.get("/destination", headers={"Accept-Encoding": f"gzip, {encoding}"})
+    decompress = library.decompress if module == "brotli" else library.ZstdDecompressor().decompress
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert json.loads(decompress(response.get_data()))[0]["Id"] == 1
@@ -0,0 +1,148 @@
+import json
+import os
+import pytest
+import config
+from flask import Flask
+import model.destination as destination_model
+from model.records import Destination
+from controller.destination_controller import get_all_destinations
+
+
+@pytest.fixture
+def catalog_file(tmp_path, monkeypatch):
+    path = tmp_path / "destinations.py"
+    path.write_text(json.dumps([{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(path))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(destination_model, "_cache_stats", {"hits": 0, "misses": 0})
+    return path
+
+
+def test_read_destination_is_cached(catalog_file):
+    """Test repeated reads are served from memory."""
+    assert destination_model.read_destination()[0].Name == "Paris"
+    destination_model.read_destination()
+    destination_model.read_destination_body()
+
+    assert destination_model.catalog_cache_stats() == {"hits": 2, "misses": 1}
+
+
+def test_read_destination_reloads_changed_file(catalog_file):
+    """Test an external change to the file invalidates the cache."""
+    destination_model.read_destination()
+    catalog_file.write_text(json.dumps([{"Id": 2, "Name": "Kyoto", "Description": "City", "Location": "Japan"}, {"Id": 3}]))
+    stat = os.stat(catalog_file)
+    os.utime(catalog_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert [d.Id for d in destination_model.read_destination()] == [2, 3]
+    assert destination_model.catalog_cache_stats()["misses"] == 2
+
+
+def test_write_destination_primes_cache(catalog_file):
+    """Test a local write updates the cache without a re-read."""
+    destinations = destination_model.read_destination()
+    destinations.append(Destination(2, "Kyoto", "City", "Japan"))
+    destination_model.write_destination(destinations)
+
+    assert len(destination_model.read_destination()) == 2
+    assert destination_model.catalog_cache_stats() == {"hits": 1, "misses": 1}
+    assert json.loads(catalog_file.read_text())[1]["Name"] == "Kyoto"
+
+
+def test_get_all_destinations_body(catalog_file):
+    """Test the cached body matches the catalog."""
+    app = Flask(__name__)
+    app.add_url_rule("/destination", "get_destination", get_all_destinations)
+
+    response = app.test_client().get("/destination")
+
+    assert response.status_code == 200
+    assert response.json == [{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]
+
+
+@pytest.fixture
+def large_catalog(tmp_path, monkeypatch):
+    path = tmp_path / "destinations.py"
+    path.write_text(json.dumps([
+        {"Id": i, "Name": f"{'Kyoto' if i % 2 else 'Paris'} {i}", "Description": "City", "Location": "Japan" if i % 2 else "France"}
+        for i in range(50, 0, -1)
+    ]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(path))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    return path
+
+
+def test_query_destinations_pages_by_id(large_catalog):
+    """Test keyset pagination walks the catalog in Id order."""
+    page, cursor = destination_model.query_destinations(20)
+    assert [d.Id for d in page] == list(range(1, 21))
+    page, cursor = destination_model.query_destinations(20, cursor=cursor)
+    assert page[0].Id == 21
+    page, cursor = destination_model.query_destinations(20, cursor=cursor)
+    assert [d.Id for d in page] == list(range(41, 51))
+    assert cursor is None
+
+
+def test_query_destinations_filters(large_catalog):
+    """Test Location and Name prefix filters."""
+    page, cursor = destination_model.query_destinations(5, location="Japan", cursor=10)
+    assert [d.Id for d in page] == [11, 13, 15, 17, 19]
+    assert cursor == 19
+
+    page, _ = destination_model.query_destinations(3, name_prefix="paris 4")
+    assert [d.Id for d in page] == [4, 40, 42]
+
+
+def test_get_destination_page(large_catalog):
+    """Test the paginated response and limit validation."""
+    app = Flask(__name__)
+    app.add_url_rule("/destination", "get_destination", get_all_destinations)
+    client = app.test_client()
+
+    response = client.get("/destination?limit=2&Location=France")
+    assert response.json == {"destinations": [
+        {"Id": 2, "Name": "Paris 2", "Description": "City", "Location": "France"},
+        {"Id": 4, "Name": "Paris 4", "Description": "City", "Location": "France"},
+    ], "next_cursor": 4}
+    assert client.get("/destination?limit=0").status_code == 400
+
+
+def test_get_all_destinations_conditional(catalog_file):
+    """Test a matching If-None-Match gets a 304 without reading the catalog."""
+    app = Flask(__name__)
+    app.add_url_rule("/destination", "get_destination", get_all_destinations)
+    client = app.test_client()
+
+    etag = client.get("/destination").headers["ETag"]
+    misses = destination_model.catalog_cache_stats()["misses"]
+    response = client.get("/destination", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert destination_model.catalog_cache_stats() == {"hits": 0, "misses": misses}
+
+    destination_model.insert_destination(Destination(2, "Kyoto", "City", "Japan"))
+    response = client.get("/destination", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_stream_destination_body_matches_cached_body(large_catalog):
+    """Test the streamed catalog is identical to the cached body."""
+    chunks = list(destination_model.stream_destination_body(chunk_size=256))
+
+    assert len(chunks) > 2
+    assert "".join(chunks) == destination_model.read_destination_body()
+
+
+def test_get_all_destinations_streams_large_catalog(large_catalog, monkeypatch):
+    """Test catalogs above the size threshold are streamed without being cached."""
+    monkeypatch.setattr(config, "DESTINATION_STREAM_MIN_BYTES", 1024)
+    monkeypatch.setattr(destination_model, "_cache_stats", {"hits": 0, "misses": 0})
+    app = Flask(__name__)
+    app.add_url_rule("/destination", "get_destination", get_all_destinations)
+
+    response = app.test_client().get("/destination")
+
+    assert response.is_streamed
+    assert len(response.json) == 50
+    assert destination_model.catalog_cache_stats() == {"hits": 0, "misses": 0}
@@ -0,0 +1,65 @@
+import json
+import pytest
+import config
+import model.destination as destination_model
+from model.records import Destination
+
+
+@pytest.fixture
+def journal_mode(tmp_path, monkeypatch):
+    path = tmp_path / "destinations.py"
+    path.write_text(json.dumps([{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]))
+    monkeypatch.setattr(config, "DESTINATION_JOURNAL", True)
+    monkeypatch.setattr(config, "JOURNAL_COMPACT_THRESHOLD", 1000)
+    monkeypatch.setattr(destination_model, "destination_file_path", str(path))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    return path
+
+
+def test_writes_append_to_journal(journal_mode, tmp_path):
+    """Test adds and deletes leave the snapshot untouched."""
+    snapshot = journal_mode.read_text()
+    assert destination_model.insert_destination(Destination(2, "Kyoto", "City", "Japan"))
+    assert destination_model.remove_destination(1)
+
+    assert journal_mode.read_text() == snapshot
+    assert len((tmp_path / "destinations.journal").read_text().splitlines()) == 2
+    assert [d.Id for d in destination_model.read_destination()] == [2]
+
+
+def test_replay_after_restart(journal_mode, monkeypatch):
+    """Test a fresh process rebuilds the catalog from snapshot and journal."""
+    destination_model.insert_destination(Destination(2, "Kyoto", "City", "Japan"))
+    destination_model.remove_destination(1)
+    monkeypatch.setattr(destination_model, "_catalog", None)
+
+    assert [d.Id for d in destination_model.read_destination()] == [2]
+
+
+def test_streaming_applies_journal(journal_mode, monkeypatch):
+    """Test the streamed catalog matches the replayed one without loading the snapshot."""
+    journal_mode.write_text(json.dumps([
+        {"Id": i, "Name": f"Place {i}", "Description": "City", "Location": "USA"} for i in range(1, 6)
+    ]))
+    destination_model.insert_destination(Destination(6, "Kyoto", "City", "Japan"))
+    destination_model.remove_destination(2)
+    destination_model.remove_destination(4)
+    destination_model.insert_destination(Destination(4, "Rebuilt", "City", "USA"))
+    destination_model.insert_destination(Destination(7, "Bali", "Island", "Indonesia"))
+    destination_model.remove_destination(6)
+    replayed = destination_model.read_destination()
+    monkeypatch.setattr(destination_model, "_load_catalog", None)
+
+    streamed = json.loads("".join(destination_model.stream_destination_body(chunk_size=64)))
+
+    assert streamed == [destination.to_dict() for destination in replayed]
+    assert [d["Id"] for d in streamed] == [1, 3, 5, 4, 7]
+
+
+def test_compaction_folds_journal(journal_mode, tmp_path):
+    """Test compaction writes a new snapshot and empties the journal."""
+    destination_model.insert_destination(Destination(2, "Kyoto", "City", "Japan"))
+    destination_model.compact_destinations()
+
+    assert [d["Id"] for d in json.loads(journal_mode.read_text())] == [1, 2]
+    assert (tmp_path / "destinations.journal").read_text() == ""
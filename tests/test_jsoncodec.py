@@ -0,0 +1,65 @@
+import json
+import pytest
+import config
+from flask import Flask, jsonify
+from utility import jsoncodec
+from utility.jsoncodec import JSONProvider
+from utility.storage import atomic_write_json, load_json
+
+SAMPLE = {"b": [1, 2.5, None, True], "a": "Café", "nested": {"z": 1, "y": "x"}}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "orjson" and jsoncodec.orjson is None:
+        pytest.skip("orjson is not installed")
+    if request.param == "stdlib":
+        monkeypatch.setattr(jsoncodec, "orjson", None)
+    return request.param
+
+
+def test_round_trip_matches_stdlib(codec):
+    """Test both encoders produce compact, key-sorted JSON the stdlib parses back."""
+    text = jsoncodec.dumps(SAMPLE, sort_keys=True)
+
+    assert json.loads(text) == SAMPLE
+    assert text.startswith('{"a":')
+    assert " " not in text.replace("Café", "")
+    assert jsoncodec.loads(text) == jsoncodec.loads(text.encode()) == SAMPLE
+
+
+def test_values_orjson_rejects_fall_back_to_stdlib(codec):
+    """Test huge integers and non-string keys still serialize."""
+    assert json.loads(jsoncodec.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+    assert json.loads(jsoncodec.dumps({1: "one"})) == {"1": "one"}
+
+
+def test_provider_serves_jsonify_and_get_json(codec):
+    """Test the provider backs jsonify and request parsing on an app."""
+    app = Flask(__name__)
+    app.json = JSONProvider(app)
+
+    @app.post("/echo")
+    def echo():
+        return jsonify(app.json.loads(app.json.dumps({"received": app.json.loads(b'{"x": 1}')})))
+
+    with app.test_client() as client:
+        response = client.post("/echo")
+
+    assert response.get_json() == {"received": {"x": 1}}
+    assert response.get_data(as_text=True).endswith("\n")
+
+
+def test_storage_indent_setting(codec, tmp_path, monkeypatch):
+    """Test data files are indented by default and compact with STORAGE_JSON_INDENT=0."""
+    path = str(tmp_path / "users.py")
+    atomic_write_json(path, [SAMPLE])
+    indented = (tmp_path / "users.py").read_bytes()
+
+    monkeypatch.setattr(config, "STORAGE_JSON_INDENT", 0)
+    atomic_write_json(path, [SAMPLE])
+    compact = (tmp_path / "users.py").read_bytes()
+
+    assert b"\n    " in indented
+    assert b"\n" not in compact and len(compact) < len(indented)
+    assert load_json(path) == [SAMPLE]
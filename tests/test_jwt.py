@@ -0,0 +1,52 @@
+import pytest
+import config
+import utility.jwt as jwt_utility
+from utility.jwt import create_jwt, verify_token, token_cache_stats
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(jwt_utility, "_token_cache", jwt_utility.OrderedDict())
+    monkeypatch.setattr(jwt_utility, "_token_cache_stats", {"hits": 0, "misses": 0})
+
+
+def test_token_round_trip():
+    """Test a created token verifies to its email."""
+    assert verify_token(create_jwt("admin@example.com")) == "admin@example.com"
+
+
+def test_invalid_and_expired_tokens(monkeypatch):
+    """Test bad or expired tokens verify to None."""
+    assert verify_token("not-a-token") is None
+    monkeypatch.setattr(config, "JWT_EXPIRES_SECONDS", -10)
+    assert verify_token(create_jwt("admin@example.com")) is None
+
+
+def test_verified_tokens_are_cached(mocker):
+    """Test repeated verification skips the signature check."""
+    token = create_jwt("admin@example.com")
+    decode = mocker.spy(jwt_utility.jwt, "decode")
+
+    for _ in range(3):
+        assert verify_token(token) == "admin@example.com"
+
+    assert decode.call_count == 1
+    assert token_cache_stats()["hits"] == 2
+
+
+def test_cache_is_bounded(monkeypatch):
+    """Test the least recently used token is evicted."""
+    monkeypatch.setattr(config, "TOKEN_CACHE_SIZE", 2)
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        verify_token(create_jwt(email))
+
+    assert token_cache_stats()["size"] == 2
+
+
+def test_tokens_without_expiry_are_rejected():
+    """Test tokens missing exp or iat do not verify."""
+    legacy = jwt_utility.jwt.encode({"email": "admin@example.com"}, config.JWT_SECRET, algorithm="HS256")
+    no_iat = jwt_utility.jwt.encode({"email": "admin@example.com", "exp": 2**31}, config.JWT_SECRET, algorithm="HS256")
+
+    assert verify_token(legacy) is None
+    assert verify_token(no_iat) is None
@@ -0,0 +1,75 @@
+import json
+import re
+import pytest
+import config
+import model.destination as destination_model
+import model.user as user_model
+from application import create_app
+from utility import metrics
+
+
+def _sample(text, series):
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    catalog = tmp_path / "destinations.py"
+    catalog.write_text(json.dumps([{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]))
+    users = tmp_path / "users.py"
+    users.write_text("[]")
+    monkeypatch.setattr(destination_model, "destination_file_path", str(catalog))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(destination_model, "_search", {"version": None, "index": None, "builder": None})
+    monkeypatch.setattr(user_model, "user_file_path", str(users))
+    monkeypatch.setattr(user_model, "_store", None)
+    monkeypatch.setattr(config, "SWAGGER_ENABLED", False)
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", 1000)
+    with create_app().test_client() as client:
+        yield client
+
+
+def test_requests_are_counted_per_route_and_status(client):
+    """Test latency histograms are keyed by route template, method and status."""
+    before = client.get("/metrics").get_data(as_text=True)
+    client.get("/destination?limit=1")
+    client.delete("/destination/7")
+    client.get("/no/such/page")
+    text = client.get("/metrics").get_data(as_text=True)
+
+    series = 'http_request_duration_seconds_count{method="GET",route="/destination",status="200"}'
+    assert _sample(text, series) == _sample(before, series) + 1
+    assert _sample(text, 'http_request_duration_seconds_count{method="DELETE",route="/destination/<id>",status="401"}') >= 1
+    assert _sample(text, 'http_request_duration_seconds_bucket{method="GET",route="<unmatched>",status="404",le="+Inf"}') >= 1
+
+
+def test_storage_and_token_operations_are_measured(client):
+    """Test named operations, bytes and parse time show up after a register and login."""
+    before = metrics.render()
+    client.post("/register", json={"username": "jane", "email": "jane@doe.com", "password": "pw"})
+    client.post("/login", json={"email": "jane@doe.com", "password": "pw"})
+    client.get("/destination")
+    text = client.get("/metrics").get_data(as_text=True)
+
+    assert _sample(text, 'app_operation_duration_seconds_count{operation="create_jwt"}') == \
+        _sample(before, 'app_operation_duration_seconds_count{operation="create_jwt"}') + 1
+    for operation in ("load_users", "save_users", "find_user", "register_user", "load_destinations"):
+        assert _sample(text, f'app_operation_duration_seconds_count{{operation="{operation}"}}') >= 1
+    assert _sample(text, 'app_storage_written_bytes_total{file="users.py"}') > _sample(before, 'app_storage_written_bytes_total{file="users.py"}')
+    assert _sample(text, 'app_storage_parse_seconds_count{file="users.py"}') >= 1
+    assert "# TYPE app_token_cache_hits_total counter" in text
+
+
+def test_timed_counts_errors():
+    """Test a failing operation is timed and counted as an error."""
+    @metrics.timed("test_failure")
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fail()
+    text = metrics.render()
+
+    assert _sample(text, 'app_operation_errors_total{operation="test_failure"}') >= 1
+    assert _sample(text, 'app_operation_duration_seconds_count{operation="test_failure"}') >= 1
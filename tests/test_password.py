@@ -0,0 +1,109 @@
+import json
+import threading
+import pytest
+from flask import Flask
+import config
+import model.user as user_model
+from model.records import InvalidRecord
+import utility.password as password_utility
+from controller.user_controller import login
+from utility.password import PasswordHashBusy, check_password, hash_password, password_hash_stats
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hashing(monkeypatch):
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", 1000)
+    monkeypatch.setattr(password_utility, "_stats", {"hashes": 0, "rejected": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+
+
+@pytest.fixture
+def user_file(tmp_path, monkeypatch):
+    path = tmp_path / "users.py"
+    path.write_text(json.dumps([{"username": "jane_doe", "email": "jane@doe.com", "password": "secret", "role": "user"}]))
+    monkeypatch.setattr(user_model, "user_file_path", str(path))
+    monkeypatch.setattr(user_model, "_store", None)
+    return path
+
+
+def test_hash_and_check():
+    """Test a hash verifies only the original password."""
+    stored = hash_password("pw")
+
+    assert stored.startswith("pbkdf2_sha256$1000$")
+    assert check_password("pw", stored) == (True, None)
+    assert check_password("wrong", stored) == (False, None)
+
+
+def test_malformed_hash_does_not_match():
+    """Test a corrupted stored hash is treated as a mismatch."""
+    assert check_password("pw", "pbkdf2_sha256$broken") == (False, None)
+    assert check_password("pw", "pbkdf2_sha256$x$y$z") == (False, None)
+
+
+def test_rehash_when_iterations_change(monkeypatch):
+    """Test a hash with outdated parameters is replaced."""
+    stored = hash_password("pw")
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", 2000)
+
+    matches, new_hash = check_password("pw", stored)
+    assert matches
+    assert new_hash.startswith("pbkdf2_sha256$2000$")
+
+
+def test_plaintext_upgraded_on_login(user_file):
+    """Test a legacy plaintext password is hashed after a successful login."""
+    assert user_model.authenticate_user("jane@doe.com", "wrong") is None
+    assert json.loads(user_file.read_text())[0]["password"] == "secret"
+
+    user = user_model.authenticate_user("jane@doe.com", "secret")
+    stored = json.loads(user_file.read_text())[0]["password"]
+    assert user.password == stored
+    assert stored.startswith("pbkdf2_sha256$")
+    assert user_model.authenticate_user("jane@doe.com", "secret").email == "jane@doe.com"
+
+
+def test_unknown_email_still_runs_kdf(user_file):
+    """Test a login for an unknown account costs a hash too."""
+    assert user_model.authenticate_user("ghost@example.com", "pw") is None
+    assert password_hash_stats()["hashes"] == 1
+
+
+def test_password_hash_stats():
+    """Test hash counts and latency are recorded."""
+    hash_password("pw")
+    stats = password_hash_stats()
+
+    assert stats["hashes"] == 1
+    assert stats["rejected"] == 0
+    assert stats["max_seconds"] >= stats["average_seconds"] > 0
+
+
+def test_busy_pool_returns_503(user_file, monkeypatch):
+    """Test logins beyond the queue limit are refused with Retry-After."""
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(password_utility, "_executor", object())
+    monkeypatch.setattr(password_utility, "_slots", slots)
+    app = Flask(__name__)
+    app.add_url_rule("/login", "login", login, methods=["POST"])
+
+    with pytest.raises(PasswordHashBusy):
+        hash_password("pw")
+    response = app.test_client().post("/login", json={"email": "jane@doe.com", "password": "secret"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert password_hash_stats()["rejected"] == 2
+
+
+def test_non_string_passwords_are_rejected(user_file):
+    """Test a password that is not text is a client error, not a failed hash."""
+    app = Flask(__name__)
+    app.add_url_rule("/login", "login", login, methods=["POST"])
+
+    response = app.test_client().post("/login", json={"email": "jane@doe.com", "password": 123456})
+
+    assert response.status_code == 400
+    with pytest.raises(InvalidRecord):
+        user_model.update_user_info("jane@doe.com", {"password": 123})
+    assert password_hash_stats()["hashes"] == 0
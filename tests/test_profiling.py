@@ -0,0 +1,48 @@
+import json
+import os
+import pstats
+import pytest
+import config
+import model.destination as destination_model
+from application import create_app
+from utility.profiling import sign_profile_request
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    catalog = tmp_path / "destinations.py"
+    catalog.write_text(json.dumps([{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(catalog))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(destination_model, "_search", {"version": None, "index": None, "builder": None})
+    monkeypatch.setattr(config, "SWAGGER_ENABLED", False)
+    monkeypatch.setattr(config, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILE_SECRET", "profile-secret")
+    monkeypatch.setattr(config, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path / "profiles"))
+    with create_app().test_client() as client:
+        yield client
+
+
+def test_signed_request_is_profiled(client):
+    """Test a signed header produces a loadable dump tagged with route and duration."""
+    response = client.get("/destination?limit=1", headers={"X-Profile": sign_profile_request("profile-secret")})
+    name = response.headers["X-Profile-File"]
+
+    assert name.split("-")[2:4] == ["destination", "200"]
+    assert name.endswith("ms.prof")
+    assert pstats.Stats(os.path.join(config.PROFILE_DIR, name)).total_calls > 0
+
+
+def test_unsigned_or_expired_requests_are_not_profiled(client):
+    """Test bad signatures and expired headers are ignored."""
+    for header in (sign_profile_request("wrong-secret"), sign_profile_request("profile-secret", ttl=-10), "garbage"):
+        assert "X-Profile-File" not in client.get("/", headers={"X-Profile": header}).headers
+    assert not os.path.exists(config.PROFILE_DIR)
+
+
+def test_sampling_profiles_without_header(client, monkeypatch):
+    """Test a sample rate of 1 profiles every request."""
+    monkeypatch.setattr(config, "PROFILE_SAMPLE_RATE", 1.0)
+
+    assert client.get("/").headers["X-Profile-File"].split("-")[2] == "root"
@@ -0,0 +1,50 @@
+import sys
+import pytest
+from model.records import Destination, InvalidRecord, User
+
+PARIS = {"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}
+
+
+def test_destination_from_json():
+    """Test a complete payload becomes a slotted record."""
+    destination = Destination.from_json(PARIS)
+
+    assert destination == Destination(1, "Paris", "City", "France")
+    assert destination.to_dict() == PARIS
+    assert not hasattr(destination, "__dict__")
+    assert sys.getsizeof(destination) < sys.getsizeof(dict(PARIS))
+
+
+@pytest.mark.parametrize("payload, error", [
+    (None, "Id, Name, Description, and Location are required"),
+    ({"Id": 1, "Description": "City", "Location": "France"}, "Id, Name, Description, and Location are required"),
+    (dict(PARIS, Id="1"), "Id must be an integer"),
+    (dict(PARIS, Id=True), "Id must be an integer"),
+    (dict(PARIS, Name=""), "Name must be a non-empty string"),
+    (dict(PARIS, Location=5), "Location must be a non-empty string"),
+    (dict(PARIS, Rating=5), "Unknown field(s): Rating"),
+])
+def test_destination_from_json_rejects(payload, error):
+    """Test invalid payloads are refused with the message the API returns."""
+    with pytest.raises(InvalidRecord, match=error.replace("(", r"\(").replace(")", r"\)")):
+        Destination.from_json(payload)
+
+
+def test_stored_records_are_never_rejected():
+    """Test records saved before validation, e.g. without a Name, still load."""
+    assert Destination.from_stored({"Id": 99995, "Location": "USA", "Description": "Canyon"}) == \
+        Destination(99995, "", "Canyon", "USA")
+
+
+def test_user_updates_are_validated():
+    """Test profile changes may only replace known fields with text."""
+    user = User("jane", "jane@doe.com", "hash")
+
+    assert user.updated({"username": "jane2"}) == User("jane2", "jane@doe.com", "hash", "user")
+    assert user.username == "jane"
+    with pytest.raises(InvalidRecord):
+        user.updated({"nickname": "jj"})
+    with pytest.raises(InvalidRecord):
+        user.updated({"username": ["jane"]})
+    with pytest.raises(InvalidRecord):
+        user.updated({"role": "admin"})
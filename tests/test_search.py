@@ -0,0 +1,129 @@
+import json
+import math
+import threading
+import pytest
+from flask import Flask
+import model.destination as destination_model
+from model.records import Destination
+from controller.destination_controller import search_destination
+from utility.search import SearchIndex, tokenize
+
+
+@pytest.fixture
+def catalog_file(tmp_path, monkeypatch):
+    path = tmp_path / "destinations.py"
+    path.write_text(json.dumps([
+        {"Id": 1, "Name": "Grand Canyon", "Description": "A massive canyon with hiking trails.", "Location": "USA"},
+        {"Id": 2, "Name": "Kyoto", "Description": "Temples, gardens and traditional houses.", "Location": "Japan"},
+        {"Id": 3, "Name": "Bali", "Description": "Beaches, rice terraces and temples.", "Location": "Indonesia"},
+    ]))
+    monkeypatch.setattr(destination_model, "destination_file_path", str(path))
+    monkeypatch.setattr(destination_model, "_catalog", None)
+    monkeypatch.setattr(destination_model, "_search", {"version": None, "index": None, "builder": None})
+    return path
+
+
+def test_tokenize_case_folds():
+    """Test tokens are lower-cased words."""
+    assert tokenize("Grand-Canyon, USA!") == ["grand", "canyon", "usa"]
+
+
+def test_search_index_ranks_and_removes():
+    """Test BM25 ranking, prefix matching and removal."""
+    index = SearchIndex(("Name", "Description"))
+    index.add(1, Destination(1, "Kyoto", "temples temples temples", "Japan"))
+    index.add(2, Destination(2, "Bali", "beaches and temples", "Indonesia"))
+
+    assert [r.Name for r in index.search("temples")] == ["Kyoto", "Bali"]
+    assert [r.Name for r in index.search("bea")] == ["Bali"]
+
+    index.remove(1)
+    assert [r.Name for r in index.search("temples")] == ["Bali"]
+    assert "kyoto" not in index.terms
+
+
+def test_stop_words_are_not_indexed():
+    """Test very common words neither match nor take index space."""
+    index = SearchIndex(("Name",))
+    index.add(1, Destination(1, "The Temple of the Moon", "", ""))
+
+    assert "the" not in index.impacts
+    assert index.search("the") == []
+    assert [r.Name for r in index.search("the moon")] == ["The Temple of the Moon"]
+
+
+def test_pruned_search_matches_exhaustive_ranking():
+    """Test early termination returns results as good as as scoring every match."""
+    words = ["river", "temple", "beach", "forest", "castle", "market", "island", "valley"]
+    records = [
+        Destination(i, " ".join(words[(i * j) % 7] for j in range(1 + i % 5)), words[i % 8] * (i % 3), "")
+        for i in range(400)
+    ]
+    index = SearchIndex.build(records, ("Name", "Description"))
+
+    for query in ("river", "temple beach", "castle market isl", "va", "river ri"):
+        *exact, prefix = query.split()
+        token_terms = [[token] for token in dict.fromkeys(exact)]
+        token_terms.append([term for term in index.terms if term.startswith(prefix)])
+        documents = len(index.records)
+        scores = {}
+        for seq in index.records:
+            for terms in token_terms:
+                weights = [0.0]
+                for term in terms:
+                    impacts = index.impacts[term]
+                    idf = math.log(1 + (documents - len(impacts) + 0.5) / (len(impacts) + 0.5))
+                    weights.append(idf * impacts.get(seq, 0.0))
+                scores[seq] = scores.get(seq, 0.0) + max(weights)
+        expected = sorted((score for score in scores.values() if score), reverse=True)[:10]
+        found = [scores[index.seq_of[r.Id]] for r in index.search(query, 10)]
+
+        assert found == pytest.approx(expected)
+
+
+def test_search_destinations_tracks_writes(catalog_file):
+    """Test adds and deletes are reflected in the index without a rebuild."""
+    assert [d.Id for d in destination_model.search_destinations("temples")] in ([2, 3], [3, 2])
+    index = destination_model._search["index"]
+
+    destination_model.insert_destination(Destination(4, "Angkor Wat", "Temples in the jungle.", "Cambodia"))
+    destination_model.remove_destination(2)
+
+    assert sorted(d.Id for d in destination_model.search_destinations("temples")) == [3, 4]
+    assert destination_model._search["index"] is index
+
+
+def test_stale_index_answers_while_rebuilding(catalog_file, monkeypatch):
+    """Test an outside change triggers a background rebuild instead of blocking the search."""
+    destination_model.search_destinations("temples")
+    index = destination_model._search["index"]
+    release = threading.Event()
+    build = SearchIndex.build
+
+    def slow_build(*args, **kwargs):
+        release.wait(5)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(destination_model.SearchIndex, "build", slow_build)
+    catalog = json.loads(catalog_file.read_text())
+    catalog_file.write_text(json.dumps(catalog + [{"Id": 4, "Name": "Petra", "Description": "Rock temples.", "Location": "Jordan"}]))
+
+    assert destination_model.search_destinations("petra") == []
+    builder = destination_model._search["builder"]
+    release.set()
+    builder.join()
+
+    assert destination_model._search["index"] is not index
+    assert [d.Id for d in destination_model.search_destinations("petra")] == [4]
+
+
+def test_search_endpoint(catalog_file):
+    """Test the search route and its validation."""
+    app = Flask(__name__)
+    app.add_url_rule("/destination/search", "search", search_destination)
+    client = app.test_client()
+
+    response = client.get("/destination/search?q=grand%20can")
+    assert response.status_code == 200
+    assert response.json["destinations"][0]["Name"] == "Grand Canyon"
+    assert client.get("/destination/search").status_code == 400
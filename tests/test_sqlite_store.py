@@ -0,0 +1,126 @@
+import json
+import threading
+import pytest
+import config
+import model.destination as destination_model
+from model.records import Destination
+import model.user as user_model
+from model import sqlite_store
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    users = tmp_path / "users.py"
+    users.write_text(json.dumps([{"username": "admin", "email": "admin@example.com", "password": "123456", "role": "admin"}]))
+    destinations = tmp_path / "destinations.py"
+    destinations.write_text(json.dumps([{"Id": 1, "Name": "Paris", "Description": "City", "Location": "France"}]))
+
+    store = sqlite_store.SqliteStore(str(tmp_path / "app.sqlite3"))
+    store.migrate_from_json(str(users), str(destinations))
+    monkeypatch.setattr(config, "STORAGE_BACKEND", "sqlite")
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", 1000)
+    monkeypatch.setattr(sqlite_store, "get_store", lambda: store)
+    return store
+
+
+def test_migration_runs_once(sqlite_backend, tmp_path):
+    """Test the JSON files are imported a single time."""
+    assert not sqlite_backend.migrate_from_json(str(tmp_path / "users.py"), str(tmp_path / "destinations.py"))
+    assert len(user_model.read_users()) == 1
+    assert destination_model.read_destination()[0].Name == "Paris"
+
+
+def test_concurrent_migrations_import_once(tmp_path, monkeypatch):
+    """Test two stores racing past the first check still migrate a single time."""
+    users = tmp_path / "users.py"
+    users.write_text(json.dumps([{"username": "admin", "email": "admin@example.com", "password": "123456", "role": "admin"}]))
+    both_checked = threading.Barrier(2)
+    read_json = sqlite_store._read_json
+
+    def read_after_both_checked(path):
+        if path == str(users):
+            both_checked.wait(5)
+        return read_json(path)
+
+    monkeypatch.setattr(sqlite_store, "_read_json", read_after_both_checked)
+    path = str(tmp_path / "app.sqlite3")
+    results = []
+    workers = [
+        threading.Thread(target=lambda: results.append(
+            sqlite_store.SqliteStore(path).migrate_from_json(str(users), str(tmp_path / "destinations.py"))
+        ))
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sorted(results) == [False, True]
+    assert len(sqlite_store.SqliteStore(path).read_users()) == 1
+
+
+def test_user_operations(sqlite_backend):
+    """Test registration, lookup and update go through SQLite."""
+    user_model.register_user("jane", "jane@doe.com", "pw")
+
+    assert user_model.user_exists(username="jane")
+    assert user_model.authenticate_user("jane@doe.com", "pw").role == "user"
+    assert user_model.update_user_info("jane@doe.com", {"username": "jane2"}).username == "jane2"
+    assert user_model.find_user_by_username("jane2").email == "jane@doe.com"
+
+
+def test_destination_writes(sqlite_backend):
+    """Test single-row inserts and deletes invalidate the cached catalog."""
+    assert destination_model.read_destination_body()
+    assert destination_model.insert_destination(Destination(2, "Kyoto", "City", "Japan"))
+    assert not destination_model.insert_destination(Destination(2, "Kyoto", "City", "Japan"))
+
+    assert [d["Id"] for d in json.loads(destination_model.read_destination_body())] == [1, 2]
+    assert destination_model.remove_destination(1)
+    assert not destination_model.remove_destination(1)
+    assert [d.Id for d in destination_model.read_destination()] == [2]
+
+
+def test_query_destinations(sqlite_backend):
+    """Test pagination and filters are answered by SQL."""
+    destination_model.insert_destination(Destination(2, "Kyoto", "City", "Japan"))
+    destination_model.insert_destination(Destination(3, "Kobe", "City", "Japan"))
+
+    page, cursor = destination_model.query_destinations(1, location="Japan")
+    assert [d.Id for d in page] == [2] and cursor == 2
+    page, cursor = destination_model.query_destinations(5, cursor=cursor, name_prefix="ko")
+    assert [d.Id for d in page] == [3] and cursor is None
+
+
+def test_insert_destinations(sqlite_backend):
+    """Test bulk inserts are all-or-nothing."""
+    assert destination_model.insert_destinations([
+        Destination(2, "Kyoto", "City", "Japan"),
+        Destination(1, "Paris", "City", "France"),
+    ]) == [1]
+    assert len(destination_model.read_destination()) == 1
+
+    assert destination_model.insert_destinations([Destination(2, "Kyoto", "City", "Japan")]) == []
+    assert len(destination_model.read_destination()) == 2
+
+
+def test_overlapping_writes_reach_search_index(sqlite_backend, monkeypatch):
+    """Test a write finishing behind a later one leaves the index stale rather than missing it."""
+    monkeypatch.setattr(destination_model, "_search", {"version": None, "index": None, "builder": None})
+    destination_model.search_destinations("paris")
+    update = destination_model._update_search_index
+    calls = []
+
+    def overlapped(*args):
+        if not calls:
+            calls.append(args)
+            destination_model.insert_destination(Destination(3, "Betatown", "Second write", "Nowhere"))
+        update(*args)
+
+    monkeypatch.setattr(destination_model, "_update_search_index", overlapped)
+    destination_model.insert_destination(Destination(2, "Alphaville", "First write", "Nowhere"))
+
+    assert destination_model._search["version"] != destination_model.catalog_version()
+    destination_model.warm_search_index().join()
+    assert [d.Id for d in destination_model.search_destinations("betatown")] == [3]
@@ -0,0 +1,51 @@
+import json
+import multiprocessing
+import os
+import pytest
+import config
+import model.user as user_model
+from utility.storage import atomic_write_json, locked
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hashing(monkeypatch):
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", 1000)
+
+
+def _register_many(path, worker):
+    user_model.user_file_path = path
+    user_model._store = None
+    for i in range(20):
+        user_model.register_user(f"user{worker}_{i}", f"user{worker}_{i}@example.com", "pw")
+
+
+def test_atomic_write_json_replaces_file(tmp_path):
+    """Test the target is replaced in one step and no temp files are left."""
+    path = tmp_path / "users.py"
+    path.write_text("[]")
+    atomic_write_json(str(path), [{"username": "admin"}])
+
+    assert json.loads(path.read_text()) == [{"username": "admin"}]
+    assert os.listdir(tmp_path) == ["users.py"]
+
+
+def test_locked_is_reentrant(tmp_path):
+    """Test a thread can take the same lock twice."""
+    path = str(tmp_path / "users.py")
+    with locked(path):
+        with locked(path):
+            pass
+
+
+def test_concurrent_processes_do_not_lose_updates(tmp_path):
+    """Test registrations from several worker processes are all kept."""
+    path = tmp_path / "users.py"
+    path.write_text("[]")
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_register_many, args=(str(path), worker)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(json.loads(path.read_text())) == 80
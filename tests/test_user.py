@@ -1,9 +1,21 @@
+import shutil
 import pytest
 from unittest.mock import MagicMock
 from flask import Flask, jsonify, request
+import model.user as user_model
 from app import home, register, login, get_profile, update_profile  # Import your functions here
 from utility.jwt import create_jwt, verify_token
 
+
+@pytest.fixture(autouse=True)
+def user_file(tmp_path, monkeypatch):
+    """Work on a copy of db/users.py: logging in re-hashes the stored password"""
+    path = tmp_path / "users.py"
+    shutil.copy(user_model.user_file_path, path)
+    monkeypatch.setattr(user_model, "user_file_path", str(path))
+    monkeypatch.setattr(user_model, "_store", None)
+    return path
+
 @pytest.fixture
 def client():
     app = Flask(__name__)
@@ -0,0 +1,76 @@
+import json
+import pytest
+import config
+from flask import Flask
+import model.user as user_model
+import controller.user_controller as user_controller
+import utility.auth as auth
+
+
+@pytest.fixture
+def user_file(tmp_path, monkeypatch):
+    path = tmp_path / "users.py"
+    path.write_text(json.dumps([
+        {"username": "admin", "email": "admin@example.com", "password": "123456", "role": "admin"},
+        {"username": "jane_doe", "email": "jane@doe.com", "password": "secret", "role": "user"},
+    ]))
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", 1000)
+    monkeypatch.setattr(user_model, "user_file_path", str(path))
+    monkeypatch.setattr(user_model, "_store", None)
+    return path
+
+
+def test_find_user_by_email_and_username(user_file):
+    """Test indexed lookups return the stored user."""
+    assert user_model.find_user_by_email("jane@doe.com").username == "jane_doe"
+    assert user_model.find_user_by_username("admin").role == "admin"
+    assert user_model.find_user_by_email("missing@example.com") is None
+    assert user_model.find_user_by_email(["jane@doe.com"]) is None
+    assert not user_model.user_exists(username={"admin": 1}, email=["jane@doe.com"])
+
+
+def test_register_user_updates_index(user_file):
+    """Test a registered user is immediately visible to lookups and on disk."""
+    user_model.register_user("new_user", "new@example.com", "pw")
+
+    assert user_model.user_exists(username="new_user")
+    assert user_model.authenticate_user("new@example.com", "pw").username == "new_user"
+    assert json.loads(user_file.read_text())[-1]["email"] == "new@example.com"
+
+
+def test_update_user_info_reindexes_username(user_file):
+    """Test renaming a user moves the username index entry."""
+    updated = user_model.update_user_info("jane@doe.com", {"email": "jane@doe.com", "username": "jane"})
+
+    assert updated.username == "jane"
+    assert user_model.find_user_by_username("jane") is updated
+    assert user_model.find_user_by_username("jane_doe") is None
+    assert user_model.update_user_info("missing@example.com", {}) is None
+
+
+def test_get_profile_conditional(user_file, monkeypatch):
+    """Test the profile ETag tracks the user's record."""
+    monkeypatch.setattr(auth, "verify_token", lambda token: "jane@doe.com")
+    app = Flask(__name__)
+    app.add_url_rule("/profile", "get_profile", user_controller.get_profile)
+    client = app.test_client()
+
+    etag = client.get("/profile").headers["ETag"]
+    assert client.get("/profile", headers={"If-None-Match": etag}).status_code == 304
+
+    user_model.update_user_info("jane@doe.com", {"username": "jane"})
+    response = client.get("/profile", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json["username"] == "jane"
+
+
+def test_update_profile_cannot_change_role(user_file, monkeypatch):
+    """Test users cannot grant themselves another role through their profile."""
+    monkeypatch.setattr(auth, "verify_token", lambda token: "jane@doe.com")
+    app = Flask(__name__)
+    app.add_url_rule("/profile", "update_profile", user_controller.update_profile, methods=["PATCH"])
+    client = app.test_client()
+
+    response = client.patch("/profile", json={"email": "jane@doe.com", "role": "admin"})
+    assert response.status_code == 400
+    assert user_model.find_user_by_email("jane@doe.com").role == "user"
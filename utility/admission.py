@@ -0,0 +1,108 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, g, jsonify, request
+import config
+from utility import metrics
+from utility.auth import current_user
+
+
+class TokenBucket:
+    """Token buckets per client key, refilled at `rate` per second up to `burst`
+
+    At most `max_keys` buckets are kept; the least recently used is dropped
+    first, which only ever lets its client start again with a full bucket.
+    """
+
+    def __init__(self, rate, burst, max_keys=100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, now=None):
+        """Spend a token for key; return 0 if there was one, else the seconds until there is"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+class RouteLimit:
+    """Concurrency slots and per-client rate limits for one route"""
+
+    def __init__(self, concurrency=None, rate=None, burst=None):
+        self.slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+        self.buckets = TokenBucket(rate, burst or max(1, math.ceil(rate))) if rate else None
+
+
+def _client_keys():
+    """The IP address, plus the account email of a valid token
+
+    An email named in the request body is deliberately not a key: anyone
+    could send it from many addresses and lock that account out.
+    """
+    keys = [f"ip:{request.remote_addr}"]
+    current_user()
+    email = g.current_user_email
+    if isinstance(email, str) and email:
+        keys.append(f"email:{email.lower()}")
+    return keys
+
+
+def _reject(status, error, retry_after, route, reason):
+    metrics.ADMISSION_REJECTED.inc((route, reason))
+    response = jsonify({"error": error})
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def _admit():
+    if request.url_rule is None:
+        return None
+    route = f"{request.method} {request.url_rule.rule}"
+    limit = current_app.extensions["admission"].get(route)
+    if limit is None:
+        return None
+
+    if limit.buckets:
+        wait = max(limit.buckets.take(key) for key in _client_keys())
+        if wait:
+            return _reject(429, "Too many requests, please slow down", wait, route, "rate")
+    if limit.slots:
+        if not limit.slots.acquire(blocking=False):
+            return _reject(503, "Server is busy, please try again", 1, route, "concurrency")
+        g.admission_slot = limit.slots
+    return None
+
+
+def _release(exc):
+    slots = g.pop("admission_slot", None)
+    if slots is not None:
+        slots.release()
+
+
+def init_app(app, limits=None):
+    """Turn away requests over the per-route limits (ADMISSION_LIMITS) before they run
+
+    Limits are keyed on "METHOD /rule", e.g. "POST /login". `concurrency`
+    caps the requests running at once in this process (503 beyond it);
+    `rate` and `burst` size a token bucket per client IP and per
+    authenticated email (429 when it is empty). Both answers carry Retry-After.
+    """
+    limits = config.ADMISSION_LIMITS if limits is None else limits
+    app.extensions["admission"] = {route: RouteLimit(**settings) for route, settings in limits.items()}
+    app.before_request(_admit)
+    app.teardown_request(_release)
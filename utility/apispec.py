@@ -0,0 +1,84 @@
+import hashlib
+import logging
+import os
+import flasgger
+from flask import current_app
+from flasgger import Swagger
+import config
+from utility import jsoncodec
+from utility.http import not_modified
+from utility.storage import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+def spec_source_hash(app):
+    """Hash everything the generated spec depends on: routes, their docstrings and the flasgger version"""
+    digest = hashlib.sha256(flasgger.__version__.encode())
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: (rule.rule, rule.endpoint)):
+        view = app.view_functions.get(rule.endpoint)
+        digest.update(repr((rule.rule, rule.endpoint, sorted(rule.methods or ()), getattr(view, "__doc__", None))).encode())
+    return digest.hexdigest()[:16]
+
+
+class CachedSwagger(Swagger):
+    """Swagger whose specs are compiled once per source hash and served as stored JSON
+
+    The first process to need a spec parses the view docstrings and writes the
+    result to SWAGGER_SPEC_DIR; later processes (and `python -m utility.apispec`
+    at build time) just read the file back.
+    """
+
+    def init_app(self, app, decorators=None):
+        super().init_app(app, decorators)
+        self._compiled = {}
+        for spec in self.config['specs']:
+            app.view_functions[f"flasgger.{spec['endpoint']}"] = self._spec_view(spec['endpoint'])
+
+    def _spec_view(self, endpoint):
+        def view():
+            source_hash, body = self.compile(endpoint)
+            cached = not_modified(source_hash)
+            if cached:
+                return cached
+            response = current_app.response_class(body, mimetype="application/json")
+            response.set_etag(source_hash)
+            return response
+        return view
+
+    def compile(self, endpoint='apispec_1'):
+        """Return (source hash, JSON body) for a spec, reading or writing the on-disk copy"""
+        compiled = self._compiled.get(endpoint)
+        if compiled:
+            return compiled
+        source_hash = spec_source_hash(self.app)
+        path = os.path.join(config.SWAGGER_SPEC_DIR, f"{endpoint}-{source_hash}.json")
+        try:
+            with open(path, "rb") as file:
+                body = file.read()
+        except FileNotFoundError:
+            spec = self.get_apispecs(endpoint)
+            body = jsoncodec.dumpb(spec)
+            try:
+                os.makedirs(config.SWAGGER_SPEC_DIR, exist_ok=True)
+                atomic_write_json(path, spec, indent=0)
+            except OSError:
+                logger.warning("Could not write the compiled API spec to %s", path, exc_info=True)
+        self._compiled[endpoint] = (source_hash, body)
+        return self._compiled[endpoint]
+
+
+if __name__ == "__main__":
+    # Build step: compile the specs of the combined app and both single-API apps
+    import app
+    import server
+    from application import create_app
+
+    if not config.SWAGGER_ENABLED:
+        raise SystemExit("Swagger is disabled (SWAGGER=0); nothing to compile")
+    for name, flask_app in (("application", create_app()), ("app", app.app), ("server", server.app)):
+        swagger = flask_app.extensions['swagger']
+        with flask_app.test_request_context():
+            for spec in swagger.config['specs']:
+                source_hash, _ = swagger.compile(spec['endpoint'])
+                print(f"{name} {spec['endpoint']}: {source_hash}")
@@ -0,0 +1,41 @@
+from functools import wraps
+from flask import g, jsonify, request
+from model.user import find_user_by_email
+from utility.jwt import verify_token
+
+
+def current_user():
+    """Return the logged-in user for this request, or None, resolving it at most once"""
+    if "current_user" not in g:
+        jwt_token = request.headers.get("Authorization", "").replace("Bearer ", "")
+        g.current_user_email = verify_token(jwt_token)
+        g.current_user = find_user_by_email(g.current_user_email) if g.current_user_email else None
+    return g.current_user
+
+
+def require_user(view):
+    """Only run the view for a valid token that belongs to a registered user"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user = current_user()
+        if not g.current_user_email:
+            return jsonify({"error": "Invalid or expired token"}), 401
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def require_role(role):
+    """Only run the view for a logged-in user with this role"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user = current_user()
+            if not user:
+                return jsonify({"message": "Unauthorized Access"}), 401
+            if user.role != role:
+                return jsonify({"error": "Forbidden Access"}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
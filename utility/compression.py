@@ -0,0 +1,68 @@
+import gzip
+from flask import request
+import config
+
+try:
+    import brotli
+except ImportError:  # gzip and zstd only
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # gzip and brotli only
+    zstandard = None
+
+# Content codings this process can produce, most preferred first when the client has no preference
+ENCODINGS = tuple(name for name, available in (("zstd", zstandard), ("br", brotli), ("gzip", True)) if available)
+
+# (per-response level, level for bodies compressed once and reused)
+LEVELS = {"zstd": (3, 12), "br": (4, 9), "gzip": (5, 9)}
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/css", "application/javascript")
+
+
+def negotiate():
+    """Return the content coding to use for this request's response, or None for identity"""
+    if not config.COMPRESSION_ENABLED:
+        return None
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(data, encoding, reused=False):
+    """Compress bytes with a content coding; reused bodies get the slower, smaller setting"""
+    level = LEVELS[encoding][reused]
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def mark_encoded(response, encoding):
+    """Label a response whose body is already compressed with encoding"""
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    # The compressed bytes differ from the identity ones, so a strong ETag no longer fits
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def _compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+    data = response.get_data()
+    if len(data) < config.COMPRESSION_MIN_BYTES:
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate()
+    if encoding:
+        response.set_data(compress(data, encoding))
+        mark_encoded(response, encoding)
+    return response
+
+
+def init_app(app):
+    """Compress buffered text and JSON responses for clients that accept it"""
+    app.after_request(_compress_response)
@@ -0,0 +1,13 @@
+from flask import current_app, request
+
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds this version, otherwise None
+
+    The comparison is weak (RFC 9110), so a tag weakened by response compression still matches.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    return None
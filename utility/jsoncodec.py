@@ -0,0 +1,75 @@
+import dataclasses
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # stdlib json only
+    orjson = None
+
+# Flask serializes datetimes as HTTP dates; orjson hands them to `default` instead of using ISO 8601
+_PASSTHROUGH = orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+
+def _default(value):
+    """Encode dataclasses (the model records) as objects, in field order"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumpb(data, sort_keys=False, indent=None, default=_default):
+    """Serialize to UTF-8 JSON bytes, compact unless indent is given"""
+    if orjson is not None and indent in (None, 2):
+        option = _PASSTHROUGH
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=default, option=option)
+        except TypeError:
+            # Integers beyond 64 bits or non-string keys; the stdlib handles (or rejects) them
+            pass
+    return _stdlib_dumps(data, sort_keys, indent, default).encode()
+
+
+def dumps(data, sort_keys=False, indent=None, default=_default):
+    """Serialize to a JSON string, compact unless indent is given"""
+    if orjson is None or indent not in (None, 2):
+        return _stdlib_dumps(data, sort_keys, indent, default)
+    return dumpb(data, sort_keys, indent, default).decode()
+
+
+def _stdlib_dumps(data, sort_keys, indent, default):
+    separators = (",", ":") if indent is None else None
+    return json.dumps(data, sort_keys=sort_keys, indent=indent, separators=separators, default=default)
+
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, encoding and decoding with orjson when it is installed
+
+    Output is the same JSON Flask produces, except that non-ASCII text is
+    written as UTF-8 rather than \\u escapes.
+    """
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop("indent", None)
+        sort_keys = kwargs.pop("sort_keys", self.sort_keys)
+        default = kwargs.pop("default", self.default)
+        kwargs.pop("separators", None)
+        if kwargs:
+            return super().dumps(obj, indent=indent, sort_keys=sort_keys, default=default, **kwargs)
+        return dumps(obj, sort_keys=sort_keys, indent=indent, default=default)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
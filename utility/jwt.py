@@ -1,28 +1,66 @@
-import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 import jwt
+import config
+from utility.metrics import timed
 
-
-def get_token_file(token):
-    token_file_path = os.path.join(os.path.dirname(__file__), "../db/token.py")
-    with open(token_file_path, "r") as file:
-        lines = file.readlines()
-    with open(token_file_path, "w") as file:
-        for line in lines:
-            if line.startswith("jwt_token"):
-                file.write(f'jwt_token = "{token}"')
-            else:
-                file.write(line)
+# token digest -> (email, cache expiry), least recently used first
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0}
 
 
+@timed("create_jwt")
 def create_jwt(email):
-    """Simulates JWT creation (not implemented)"""
-    encoded = jwt.encode({"email": email}, "secret", algorithm="HS256")
-    get_token_file(encoded)
+    """Create a signed token for the user, valid for JWT_EXPIRES_SECONDS"""
+    issued_at = int(time.time())
+    claims = {"email": email, "iat": issued_at, "exp": issued_at + config.JWT_EXPIRES_SECONDS}
+    return jwt.encode(claims, config.JWT_SECRET, algorithm="HS256")
+
+
+def _token_digest(token):
+    if isinstance(token, str):
+        token = token.encode()
+    return hashlib.sha256(config.JWT_SECRET.encode() + b"\0" + token).digest()
 
 
+@timed("verify_token")
 def verify_token(token):
-    """Simulates JWT token verification and returns the email"""
-    decode=jwt.decode(token, "secret", algorithms=["HS256"])
-    return decode["email"]
+    """Verify a token and return its email, or None if it is invalid or expired"""
+    digest = _token_digest(token) if config.TOKEN_CACHE_SIZE else None
+    now = time.time()
+    if digest:
+        with _token_cache_lock:
+            entry = _token_cache.get(digest)
+            if entry and entry[1] > now:
+                _token_cache.move_to_end(digest)
+                _token_cache_stats["hits"] += 1
+                return entry[0]
+            if entry:
+                del _token_cache[digest]
+            _token_cache_stats["misses"] += 1
+
+    try:
+        decode = jwt.decode(token, config.JWT_SECRET, algorithms=["HS256"], options={"require": ["exp", "iat"]})
+    except jwt.InvalidTokenError:
+        return None
+
+    email = decode.get("email")
+    if digest:
+        expires_at = min(now + config.TOKEN_CACHE_TTL, decode["exp"])
+        with _token_cache_lock:
+            _token_cache[digest] = (email, expires_at)
+            while len(_token_cache) > config.TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return email
 
 
+def token_cache_stats():
+    """Return hit/miss counters, current size and hit rate of the verified-token cache"""
+    with _token_cache_lock:
+        stats = dict(_token_cache_stats, size=len(_token_cache))
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from flask import current_app, g, request
+
+# Latency buckets in seconds, from sub-millisecond cache hits to multi-second catalog rewrites
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing value per label set"""
+
+    def __init__(self, name, help, label_names=()):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values = {}
+        _registry.append(self)
+
+    def inc(self, labels=(), amount=1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with _lock:
+            values = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in values)
+        return lines
+
+
+class Histogram:
+    """Observation counts in fixed buckets, plus their sum and count, per label set"""
+
+    def __init__(self, name, help, label_names=(), buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        _registry.append(self)
+
+    def observe(self, value, labels=()):
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            series = sorted((labels, (list(counts), total, count)) for labels, (counts, total, count) in self._series.items())
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else _number(float(bound))
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to build the response, by route and status", ("method", "route", "status"))
+OPERATION_DURATION = Histogram(
+    "app_operation_duration_seconds", "Time spent in storage and token operations", ("operation",))
+OPERATION_ERRORS = Counter(
+    "app_operation_errors_total", "Storage and token operations that raised", ("operation",))
+PARSE_DURATION = Histogram("app_storage_parse_seconds", "Time to read and parse a whole data file", ("file",))
+WRITE_DURATION = Histogram("app_storage_write_seconds", "Time to serialize and durably write a data file", ("file",))
+BYTES_READ = Counter("app_storage_read_bytes_total", "Bytes read from data files", ("file",))
+BYTES_WRITTEN = Counter("app_storage_written_bytes_total", "Bytes written to data files", ("file",))
+ADMISSION_REJECTED = Counter(
+    "app_admission_rejected_total", "Requests turned away by rate (429) or concurrency (503) limits", ("route", "reason"))
+
+
+def timed(operation):
+    """Record the duration of every call, and failed calls, under this operation name"""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                OPERATION_ERRORS.inc((operation,))
+                raise
+            finally:
+                OPERATION_DURATION.observe(time.perf_counter() - start, (operation,))
+        return wrapper
+    return decorator
+
+
+def record_read(path, size):
+    BYTES_READ.inc((os.path.basename(path),), size)
+
+
+def record_written(path, size):
+    BYTES_WRITTEN.inc((os.path.basename(path),), size)
+
+
+def _cache_stats():
+    """Counters the caches and the hashing pool already keep"""
+    # Imported here: the models import this module for @timed
+    from model.destination import catalog_cache_stats
+    from utility.jwt import token_cache_stats
+    from utility.password import password_hash_stats
+
+    groups = [
+        ("app_catalog_cache", "Destination catalog cache", catalog_cache_stats(),
+         (("hits_total", "counter", "hits"), ("misses_total", "counter", "misses"))),
+        ("app_token_cache", "Verified-token cache", token_cache_stats(),
+         (("hits_total", "counter", "hits"), ("misses_total", "counter", "misses"), ("entries", "gauge", "size"))),
+        ("app_password_hash", "Password hashing pool", password_hash_stats(),
+         (("hashes_total", "counter", "hashes"), ("rejected_total", "counter", "rejected"),
+          ("seconds_total", "counter", "total_seconds"))),
+    ]
+    lines = []
+    for prefix, help, stats, series in groups:
+        for suffix, kind, key in series:
+            name = f"{prefix}_{suffix}"
+            lines.extend((f"# HELP {name} {help}: {key}", f"# TYPE {name} {kind}", f"{name} {_number(stats[key])}"))
+    return lines
+
+
+def render():
+    """Return every metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    lines.extend(_cache_stats())
+    return "\n".join(lines) + "\n"
+
+
+def _start_timer():
+    g.metrics_start = time.perf_counter()
+
+
+def _observe_request(response):
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        # Unmatched URLs share one label so scanners cannot create unbounded series
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        REQUEST_DURATION.observe(time.perf_counter() - start, (request.method, route, str(response.status_code)))
+    return response
+
+
+def metrics_view():
+    """Prometheus metrics for this process"""
+    return current_app.response_class(render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    """Time every request of the app and serve the metrics at /metrics"""
+    app.before_request(_start_timer)
+    app.after_request(_observe_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
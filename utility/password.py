@@ -0,0 +1,118 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+
+ALGORITHM = "pbkdf2_sha256"
+_DUMMY_SALT = os.urandom(16)
+
+_executor = None
+_slots = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"hashes": 0, "rejected": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+
+
+class PasswordHashBusy(Exception):
+    """Raised when the hashing queue is full and the request should be retried later"""
+
+
+def _reset_pool():
+    """Drop the parent's pool in a forked child, whose copy has no worker threads"""
+    global _executor, _slots, _pool_lock
+    _executor = None
+    _slots = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_pool)
+
+
+def _derive(password, salt, iterations):
+    started = time.perf_counter()
+    derived = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        _stats["hashes"] += 1
+        _stats["total_seconds"] += elapsed
+        _stats["max_seconds"] = max(_stats["max_seconds"], elapsed)
+    return derived
+
+
+def _hash(password):
+    salt = os.urandom(16)
+    iterations = config.PASSWORD_HASH_ITERATIONS
+    derived = _derive(password, salt, iterations)
+    return "$".join([ALGORITHM, str(iterations), base64.b64encode(salt).decode(), base64.b64encode(derived).decode()])
+
+
+def _check(password, stored):
+    if not stored:
+        return False, None
+    if not stored.startswith(ALGORITHM + "$"):
+        # Legacy plaintext entry: compare, then hash it on success
+        if hmac.compare_digest(stored.encode(), password.encode()):
+            return True, _hash(password)
+        return False, None
+    try:
+        _, iterations, salt, expected = stored.split("$")
+        iterations = int(iterations)
+        salt = base64.b64decode(salt, validate=True)
+        expected = base64.b64decode(expected, validate=True)
+    except ValueError:
+        return False, None
+    derived = _derive(password, salt, iterations)
+    if not hmac.compare_digest(derived, expected):
+        return False, None
+    if iterations != config.PASSWORD_HASH_ITERATIONS:
+        return True, _hash(password)
+    return True, None
+
+
+def _run(function, *args):
+    """Run a hashing job on the worker pool, refusing it if too many are already waiting"""
+    global _executor, _slots
+    with _pool_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+            _slots = threading.BoundedSemaphore(config.PASSWORD_HASH_WORKERS + config.PASSWORD_HASH_QUEUE)
+        executor, slots = _executor, _slots
+    if not slots.acquire(blocking=False):
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise PasswordHashBusy()
+    try:
+        return executor.submit(function, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(password):
+    """Return a salted PBKDF2 hash of the password"""
+    return _run(_hash, password)
+
+
+def check_password(password, stored):
+    """Check a password against its stored value
+
+    Returns (matches, new_hash); new_hash is set when the stored value is
+    plaintext or uses outdated parameters and should be replaced.
+    """
+    return _run(_check, password, stored)
+
+
+def burn_password_check(password):
+    """Spend the same KDF time as a real check, so unknown accounts are not faster to reject"""
+    _run(_derive, password, _DUMMY_SALT, config.PASSWORD_HASH_ITERATIONS)
+
+
+def password_hash_stats():
+    """Return hash counts, rejections and latency"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["average_seconds"] = stats["total_seconds"] / stats["hashes"] if stats["hashes"] else 0.0
+    return stats
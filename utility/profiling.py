@@ -0,0 +1,76 @@
+import cProfile
+import hashlib
+import hmac
+import os
+import random
+import re
+import time
+from flask import g, request
+import config
+
+HEADER = "X-Profile"
+
+
+def sign_profile_request(secret, ttl=300):
+    """Return an X-Profile header value that asks for a profile until it expires"""
+    expires = str(int(time.time()) + ttl)
+    signature = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def _signed(value):
+    """Whether the header carries an unexpired signature made with PROFILE_SECRET"""
+    if not value or not config.PROFILE_SECRET:
+        return False
+    expires, _, signature = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = hmac.new(config.PROFILE_SECRET.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature, expected)
+
+
+def _start_profile():
+    if _signed(request.headers.get(HEADER)) or random.random() < config.PROFILE_SAMPLE_RATE:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler already owns this thread
+            return
+        g.profile_start = time.perf_counter()
+        g.profiler = profiler
+
+
+def _dump_profile(response):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    duration_ms = (time.perf_counter() - g.pop("profile_start")) * 1000
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{request.method}-{slug}-{response.status_code}-{duration_ms:.0f}ms.prof"
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(os.path.join(config.PROFILE_DIR, name))
+    response.headers["X-Profile-File"] = name
+    return response
+
+
+def _stop_profile(exc):
+    # after_request is skipped if another hook raised; never leave a profiler running
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+
+
+def init_app(app):
+    """Profile sampled requests, and requests with a signed X-Profile header, into PROFILE_DIR"""
+    app.before_request(_start_profile)
+    app.after_request(_dump_profile)
+    app.teardown_request(_stop_profile)
+
+
+if __name__ == "__main__":
+    # Print a header value for: curl -H "X-Profile: <value>" ...
+    if not config.PROFILE_SECRET:
+        raise SystemExit("PROFILE_SECRET is not set")
+    print(sign_profile_request(config.PROFILE_SECRET))
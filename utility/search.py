@@ -0,0 +1,180 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Too common to help ranking; left out of the index and of queries
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were with".split()
+)
+
+
+def tokenize(text):
+    """Split text into case-folded word tokens"""
+    return TOKEN_PATTERN.findall(str(text).casefold())
+
+
+class SearchIndex:
+    """In-memory inverted index over selected record fields, ranked with BM25
+
+    Each term keeps its postings ordered by BM25 impact, so a query walks the
+    best postings of every term together and stops as soon as no unseen
+    record can beat the current top results (Fagin's threshold algorithm).
+    The last query token also matches as a prefix, capped at
+    `max_expansions` terms.
+    """
+
+    def __init__(self, fields, k1=1.2, b=0.75, max_expansions=50):
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        self.max_expansions = max_expansions
+        self.impacts = {}
+        self.ordered = {}
+        self.terms = []
+        self.records = {}
+        self.doc_terms = {}
+        self.seq_of = {}
+        self.next_seq = 0
+        self.average_length = None
+
+    @classmethod
+    def build(cls, records, fields, id_field='Id', **options):
+        """Index many records at once, sorting every posting list a single time"""
+        index = cls(fields, **options)
+        counted = [(getattr(record, id_field), record, index._count(record)) for record in records]
+        lengths = [sum(counts.values()) for _, _, counts in counted]
+        index.average_length = (sum(lengths) / len(lengths) if lengths else 0) or 1
+        for (doc_id, record, counts), length in zip(counted, lengths):
+            index._insert(doc_id, record, counts, length, keep_sorted=False)
+        for ordered in index.ordered.values():
+            ordered.sort()
+        index.terms = sorted(index.impacts)
+        return index
+
+    def __len__(self):
+        return len(self.records)
+
+    def _count(self, record):
+        counts = Counter()
+        for field in self.fields:
+            counts.update(token for token in tokenize(getattr(record, field, None) or "") if token not in STOP_WORDS)
+        return counts
+
+    def _insert(self, doc_id, record, counts, length, keep_sorted=True):
+        seq = self.next_seq
+        self.next_seq += 1
+        self.seq_of[doc_id] = seq
+        self.records[seq] = record
+        self.doc_terms[seq] = tuple(counts)
+        norm = self.k1 * (1 - self.b + self.b * length / self.average_length)
+        for term, frequency in counts.items():
+            impact = frequency * (self.k1 + 1) / (frequency + norm)
+            impacts = self.impacts.get(term)
+            if impacts is None:
+                impacts = self.impacts[term] = {}
+                self.ordered[term] = []
+                if keep_sorted:
+                    insort(self.terms, term)
+            impacts[seq] = impact
+            if keep_sorted:
+                insort(self.ordered[term], (-impact, seq))
+            else:
+                self.ordered[term].append((-impact, seq))
+
+    def add(self, doc_id, record):
+        if doc_id in self.seq_of:
+            self.remove(doc_id)
+        counts = self._count(record)
+        length = sum(counts.values())
+        if self.average_length is None:
+            self.average_length = length or 1
+        self._insert(doc_id, record, counts, length)
+
+    def remove(self, doc_id):
+        seq = self.seq_of.pop(doc_id, None)
+        if seq is None:
+            return
+        del self.records[seq]
+        for term in self.doc_terms.pop(seq):
+            impact = self.impacts[term].pop(seq)
+            ordered = self.ordered[term]
+            del ordered[bisect_left(ordered, (-impact, seq))]
+            if not ordered:
+                del self.impacts[term]
+                del self.ordered[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def _expand(self, prefix):
+        start = bisect_left(self.terms, prefix)
+        expanded = []
+        for term in self.terms[start:start + self.max_expansions]:
+            if not term.startswith(prefix):
+                break
+            expanded.append(term)
+        return expanded
+
+    def _weighted(self, term, documents):
+        """Return the term's IDF, its impacts and its postings scaled by that IDF, best first"""
+        impacts = self.impacts[term]
+        idf = math.log(1 + (documents - len(impacts) + 0.5) / (len(impacts) + 0.5))
+        return idf, impacts, ((negative_impact * idf, seq) for negative_impact, seq in self.ordered[term])
+
+    def _score(self, weights, seq):
+        """Return the best IDF-weighted impact any of the token's terms has in the record"""
+        doc_terms = self.doc_terms[seq]
+        terms = weights if len(weights) <= len(doc_terms) else [term for term in doc_terms if term in weights]
+        return max((weights[term][0] * weights[term][1].get(seq, 0.0) for term in terms), default=0.0)
+
+    def search(self, query, limit=20):
+        """Return up to `limit` records ranked by relevance to the query
+
+        Every query token contributes its best-scoring term, so a short prefix
+        expanding to many terms still counts once per record.
+        """
+        tokens = [token for token in tokenize(query) if token not in STOP_WORDS]
+        if not tokens or not self.records:
+            return []
+
+        documents = len(self.records)
+        token_terms = [[token] if token in self.impacts else [] for token in dict.fromkeys(tokens[:-1])]
+        token_terms.append(self._expand(tokens[-1]))
+        groups = []
+        for terms in token_terms:
+            if not terms:
+                continue
+            weighted = [self._weighted(term, documents) for term in terms]
+            postings = weighted[0][2] if len(weighted) == 1 else heapq.merge(*(entry[2] for entry in weighted))
+            groups.append([{term: entry[:2] for term, entry in zip(terms, weighted)}, postings, math.inf])
+
+        # Each group's frontier caps what it can add to a record it has not yielded yet
+        best = []
+        seen = set()
+        while groups:
+            for group in groups:
+                posting = next(group[1], None)
+                if posting is None:
+                    group[2] = 0.0
+                    continue
+                negative_score, seq = posting
+                group[2] = -negative_score
+                if seq in seen:
+                    continue
+                seen.add(seq)
+                if len(best) == limit:
+                    ceiling = sum(other[2] for other in groups)
+                    if ceiling <= best[0][0]:
+                        continue
+                entry = (sum(self._score(weights, seq) for weights, _, _ in groups), -seq)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+            groups = [group for group in groups if group[2]]
+            if len(best) == limit and sum(group[2] for group in groups) <= best[0][0]:
+                break
+
+        return [self.records[-negative_seq] for _, negative_seq in sorted(best, reverse=True)]
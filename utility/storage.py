@@ -0,0 +1,157 @@
+import os
+import json
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+import config
+from utility import jsoncodec, metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+def file_signature(path):
+    """Return a (mtime, size, inode) tuple identifying the current file contents"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+_held_locks = threading.local()
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive advisory lock on <path>.lock, shared by every worker process
+
+    The lock is re-entrant within a thread, so a locked read-modify-write can
+    call helpers that take the same lock.
+    """
+    held = _held_locks.__dict__.setdefault("paths", set())
+    if path in held:
+        yield
+        return
+    with open(path + ".lock", "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def atomic_write_json(path, data, indent=None):
+    """Write JSON to a temporary file and rename it over path, so readers never see a partial file
+
+    indent defaults to STORAGE_JSON_INDENT; 0 writes compact JSON.
+    """
+    start = time.perf_counter()
+    if indent is None:
+        indent = config.STORAGE_JSON_INDENT
+    atomic_write_bytes(path, jsoncodec.dumpb(data, indent=indent or None), started=start)
+
+
+def atomic_write_bytes(path, payload, started=None):
+    """Write bytes to a temporary file and rename it over path, so readers never see a partial file"""
+    start = time.perf_counter() if started is None else started
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+            metrics.record_written(path, os.fstat(file.fileno()).st_size)
+        os.replace(tmp_path, path)
+        metrics.WRITE_DURATION.observe(time.perf_counter() - start, (os.path.basename(path),))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def append_journal(path, records):
+    """Append JSON records, one per line, in a single write"""
+    payload = b"".join(jsoncodec.dumpb(record) + b"\n" for record in records)
+    with open(path, "ab") as file:
+        file.write(payload)
+        file.flush()
+    metrics.record_written(path, len(payload))
+
+
+def read_journal(path):
+    """Return the records of a JSON-lines journal, skipping a torn trailing line"""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "rb") as file:
+        metrics.record_read(path, os.fstat(file.fileno()).st_size)
+        for line in file:
+            try:
+                records.append(jsoncodec.loads(line))
+            except ValueError:
+                break
+    return records
+
+
+def load_json(path):
+    """Parse a whole JSON file, recording its size and parse time"""
+    start = time.perf_counter()
+    with open(path, "rb") as file:
+        data = file.read()
+    metrics.record_read(path, len(data))
+    data = jsoncodec.loads(data)
+    metrics.PARSE_DURATION.observe(time.perf_counter() - start, (os.path.basename(path),))
+    return data
+
+
+def iter_json_array(path, chunk_size=64 * 1024):
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as file:
+        buffer = ""
+        position = 0
+        eof = False
+        started = False
+
+        def skip(chars):
+            nonlocal position
+            while position < len(buffer) and buffer[position] in chars:
+                position += 1
+
+        while True:
+            skip(" \t\r\n," if started else " \t\r\n")
+            if not started and position < len(buffer):
+                if buffer[position] != "[":
+                    raise ValueError(f"{path} does not contain a JSON array")
+                started = True
+                position += 1
+                continue
+            if started and position < len(buffer) and buffer[position] == "]":
+                return
+            if position < len(buffer):
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if eof:
+                        raise
+                else:
+                    # A value ending exactly at the buffer edge may be truncated (e.g. a number)
+                    if end < len(buffer) or eof:
+                        yield value
+                        position = end
+                        continue
+            elif eof:
+                raise ValueError(f"{path} ends before the JSON array is closed")
+
+            chunk = file.read(chunk_size)
+            metrics.record_read(path, len(chunk.encode()))
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0